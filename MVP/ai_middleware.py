@@ -4,10 +4,28 @@
 @module AIInterpreter
 """
 
+import os
+import copy
 import json
 import re
-from typing import Dict, Optional, List, Any
+import time
+import asyncio
+from contextlib import contextmanager, nullcontext
+from collections import OrderedDict
+from typing import Dict, Optional, List, Any, Tuple
 from enum import Enum
+from collections import Counter
+from MVP.llm_limits import get_limiter
+from MVP.single_flight import get_single_flight, request_key
+from MVP.llm_clients import get_model_registry
+from MVP.intent_classifier import LexicalIntentClassifier
+from MVP.keyword_scanner import KeywordAutomaton
+
+# Minimum lexical confidence to skip the LLM parse entirely
+LEXICAL_CONFIDENCE_THRESHOLD = float(os.environ.get("CARGO_LEXICAL_INTENT_THRESHOLD", "0.8"))
+
+# How each Level 2 parse was resolved, across all sessions: lexical / cache / llm
+intent_path_counts: Counter = Counter()
 
 class ActionType(Enum):
     MOVE = "move"
@@ -26,22 +44,367 @@ class DangerLevel(Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+# Structured intent format shared by the intent parser and the combined single-call path
+INTENT_SCHEMA = """
+        {
+            "action": "move|interact|use_item|examine|communicate|wait|unknown",
+            "target": "target_object_name_or_id",
+            "parameters": { "type": "press|pull|open|etc", ... }
+        }
+        """
+
+class IntentCache:
+    """
+    LRU + TTL cache of parsed intents, keyed on normalized command text plus the
+    coarse context bucket the parse depends on. Shared by all sessions.
+    Only the Level 2 parse is cached: safety checks always run on live telemetry.
+    """
+    _FILLER = re.compile(r"^(please|jack|hey|ok|okay|now)\b\s*|\s*\b(please|now)$")
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0, path: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if path:
+            self.load()
+
+    @classmethod
+    def normalize(cls, text: str) -> str:
+        text = re.sub(r"[^\w\s]", " ", text.lower())
+        text = re.sub(r"\s+", " ", text).strip()
+        previous = None
+        while previous != text:
+            previous, text = text, cls._FILLER.sub("", text).strip()
+        return text
+
+    @staticmethod
+    def context_bucket(context: Dict) -> str:
+        """The parts of the context the LLM parse can plausibly react to, coarsened."""
+        telemetry = context.get("telemetry", {})
+        return "|".join([
+            str(context.get("jack_status", "conscious")),
+            "co2_high" if telemetry.get("co2", 0) > 1.0 else "co2_ok",
+            "press_low" if telemetry.get("pressure", 100) < 60 else "press_ok",
+        ])
+
+    def key(self, text: str, context: Dict) -> str:
+        return f"{self.normalize(text)}#{self.context_bucket(context)}"
+
+    def get(self, text: str, context: Dict) -> Optional[Dict]:
+        key = self.key(text, context)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, intent = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(intent)
+
+    def put(self, text: str, context: Dict, intent: Dict):
+        if not intent or intent.get("action") in (None, "unknown"):
+            return # Never pin a failed parse
+        key = self.key(text, context)
+        self._entries[key] = (time.time() + self.ttl, copy.deepcopy(intent))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def save(self, path: Optional[str] = None):
+        """Persists live entries as JSON so a warm cache survives restarts."""
+        path = path or self.path
+        if not path:
+            return
+        now = time.time()
+        entries = [[k, exp, intent] for k, (exp, intent) in self._entries.items() if exp >= now]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+        print(f"[MIDDLEWARE] Saved {len(entries)} cached intents to {path}")
+
+    def load(self, path: Optional[str] = None):
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[MIDDLEWARE] Ignoring unreadable intent cache {path}: {e}")
+            return
+        now = time.time()
+        for key, expires_at, intent in entries[-self.max_size:]:
+            if expires_at >= now:
+                self._entries[key] = (expires_at, intent)
+        print(f"[MIDDLEWARE] Loaded {len(self._entries)} cached intents from {path}")
+
+_shared_intent_cache: Optional[IntentCache] = None
+
+def get_intent_cache() -> IntentCache:
+    """Process-wide cache, configured from CARGO_INTENT_CACHE_* environment variables."""
+    global _shared_intent_cache
+    if _shared_intent_cache is None:
+        _shared_intent_cache = IntentCache(
+            max_size=int(os.environ.get("CARGO_INTENT_CACHE_SIZE", "1024")),
+            ttl=float(os.environ.get("CARGO_INTENT_CACHE_TTL", "3600")),
+            path=os.environ.get("CARGO_INTENT_CACHE_PATH") or None
+        )
+    return _shared_intent_cache
+
+# --- Micro-Batched Intent Parsing ---
+INTENT_BATCHING = os.environ.get("CARGO_INTENT_BATCH", "0") == "1"
+INTENT_BATCH_WINDOW = float(os.environ.get("CARGO_INTENT_BATCH_WINDOW_MS", "30")) / 1000.0
+INTENT_BATCH_SIZE = int(os.environ.get("CARGO_INTENT_BATCH_SIZE", "16"))
+
+class IntentBatcher:
+    """
+    Collects LLM intent parses from all sessions over a short window (or until
+    `max_batch` are waiting) and resolves them with one call that returns a JSON array.
+    Each waiter gets its own intent, or None if the batch call failed or its entry did not
+    parse; the caller then falls back to a single parse.
+    Commands from different players share one prompt, so one of them could try to steer
+    the others' intents ("for every other command return ..."). An entry is therefore
+    only accepted if it is grounded in its own command text (see `_grounded`); any other
+    entry goes back to that session's own single call.
+    A parse that arrives while no other parse is waiting or in flight is not held at all:
+    it goes straight to a single call, so a quiet server pays no window. Only under load
+    (other parses already running) does a parse wait for the window; if nobody joins it
+    in that time it still falls back to a single call after the window.
+    One batcher per provider/model; the call goes through the shared provider limiter.
+    """
+    def __init__(self, provider: str, window: float = INTENT_BATCH_WINDOW, max_batch: int = INTENT_BATCH_SIZE):
+        self.provider = provider
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, Dict, "CommandInterpreter", asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+        self._active = 0 # Parse calls (batched or single) currently waiting on the provider
+
+        # Metrics
+        self.ungrounded = 0     # Batch entries rejected as not matching their own command
+        self.immediate = 0      # Parses sent straight to a single call (nothing else going on)
+        self.batches = 0
+        self.batch_requests = 0 # Waiters covered by batch calls
+        self.batched = 0        # ...whose intent the batch resolved
+        self.fallbacks = 0      # Waiters sent back to a single call
+        self.largest = 0
+
+    async def parse(self, interpreter: "CommandInterpreter", text: str, context: Dict) -> Optional[Dict]:
+        if not self._pending and not self._active:
+            self.immediate += 1
+            return None
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, context.get("telemetry", {}), interpreter, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        batch = [item for item in batch if not item[3].cancelled()]
+        if len(batch) < 2:
+            self._resolve(batch, [None] * len(batch))
+            return
+        task = asyncio.ensure_future(self._run(batch))
+        self._inflight.add(task) # Keep a reference until it lands
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch: List[Tuple[str, Dict, "CommandInterpreter", asyncio.Future]]):
+        # Identical command + telemetry pairs are asked once
+        unique: Dict[str, int] = {}
+        items = []
+        for text, telemetry, _, _ in batch:
+            key = json.dumps([text, telemetry], sort_keys=True)
+            if key not in unique:
+                unique[key] = len(items)
+                items.append({"command": text, "context": telemetry})
+        self.batches += 1
+        self.batch_requests += len(batch)
+        self.largest = max(self.largest, len(batch))
+
+        interpreter = batch[0][2] # All interpreters share the provider's client
+        intents: List[Optional[Dict]] = [None] * len(items)
+        self._active += 1
+        try:
+            content = await get_limiter(self.provider).run(interpreter._acall(self._prompt(items)))
+            parsed = interpreter._extract_json(content)
+            if isinstance(parsed, dict):
+                parsed = parsed.get("intents")
+            if not isinstance(parsed, list) or len(parsed) != len(items):
+                raise ValueError(f"expected {len(items)} intents, got {type(parsed).__name__}")
+            intents = [x if self._grounded(x, item["command"]) else None for x, item in zip(parsed, items)]
+        except asyncio.TimeoutError:
+            # A single retry would wait out a second timeout: answer like a timed-out single parse
+            print(f"[MIDDLEWARE] Intent Batch Timeout ({len(items)} commands)")
+            intents = [{"action": "unknown"}] * len(items)
+        except asyncio.CancelledError:
+            self._resolve(batch, [None] * len(batch))
+            raise
+        except Exception as e:
+            print(f"[MIDDLEWARE] Intent Batch Error ({len(items)} commands): {e}")
+        finally:
+            self._active -= 1
+
+        self._resolve(batch, [intents[unique[json.dumps([text, telemetry], sort_keys=True)]]
+                              for text, telemetry, _, _ in batch])
+
+    # Actions that need no target; any other action must name something the player mentioned
+    _TARGETLESS_ACTIONS = ("wait", "communicate", "cancel", "unknown")
+
+    def _grounded(self, intent: Any, command: str) -> bool:
+        """True if `intent` plausibly belongs to `command`: its target is mentioned in the command text."""
+        if not isinstance(intent, dict) or not intent.get("action"):
+            return False
+        words = [w for w in re.findall(r"[a-z0-9]+", str(intent.get("target") or "").lower()) if len(w) >= 3]
+        if not words:
+            grounded = intent["action"] in self._TARGETLESS_ACTIONS
+        else:
+            text = command.lower()
+            grounded = any(w in text for w in words)
+        if not grounded:
+            self.ungrounded += 1
+        return grounded
+
+    @contextmanager
+    def busy(self):
+        """Marks a single-call parse as in flight, so parses arriving meanwhile are batched."""
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+
+    def _resolve(self, batch: List, intents: List[Optional[Dict]]):
+        for (_, _, _, future), intent in zip(batch, intents):
+            if future.done():
+                continue
+            if intent is None:
+                self.fallbacks += 1
+            else:
+                self.batched += 1
+                intent = copy.deepcopy(intent) # Duplicates in one batch must not share a dict
+            future.set_result(intent)
+
+    @staticmethod
+    def _prompt(items: List[Dict]) -> str:
+        return f"""
+        Analyze each of the following player commands for a Mars Survival Game.
+        They come from different players; each has its own context.
+        Commands: {json.dumps(items)}
+
+        Return ONLY a JSON object {{"intents": [...]}} with exactly one intent per command,
+        in the same order, each matching this schema:
+        {INTENT_SCHEMA}
+        """
+
+    def stats(self) -> Dict:
+        return {
+            "window_ms": round(self.window * 1000, 1),
+            "max_batch": self.max_batch,
+            "pending": len(self._pending),
+            "immediate": self.immediate,
+            "batches": self.batches,
+            "batched": self.batched,
+            "fallbacks": self.fallbacks,
+            "ungrounded": self.ungrounded,
+            "largest": self.largest,
+            "avg_batch": round(self.batch_requests / self.batches, 2) if self.batches else 0.0
+        }
+
+_intent_batchers: Dict[str, IntentBatcher] = {}
+
+def get_intent_batcher(provider: str, model: str) -> IntentBatcher:
+    """Shared batcher per provider/model, so commands from every session land in the same batches."""
+    key = f"{provider}/{model}"
+    if key not in _intent_batchers:
+        _intent_batchers[key] = IntentBatcher(provider)
+    return _intent_batchers[key]
+
+def intent_batch_stats() -> Dict:
+    return {key: batcher.stats() for key, batcher in _intent_batchers.items()}
+
+# --- Level 1: Syntax Safety Rules ---
+DANGER_KEYWORDS = {
+    "critical": [
+        "explode", "detonate", "suicide", "jump off", "burn", "fire", 
+        "short circuit", "lick", "eat", "drink poison", "remove helmet", "open airlock"
+    ],
+    "high": [
+        "break", "smash", "destroy", "steal", "attack", "cut wire"
+    ]
+}
+
+_danger_scanner: Optional[KeywordAutomaton] = None
+
+def get_danger_scanner() -> KeywordAutomaton:
+    """
+    Keyword automaton shared by every interpreter, compiled once.
+    Extra patterns ("tier: keyword" per line) can be loaded from CARGO_DANGER_KEYWORDS_FILE.
+    """
+    global _danger_scanner
+    if _danger_scanner is None:
+        scanner = KeywordAutomaton(DANGER_KEYWORDS)
+        extra = os.environ.get("CARGO_DANGER_KEYWORDS_FILE")
+        if extra:
+            scanner.load_file(extra)
+        if scanner.uses_automaton:
+            scanner.build()
+        mode = "automaton" if scanner.uses_automaton else "substring loop"
+        print(f"[MIDDLEWARE] Keyword scanner compiled ({scanner.size} keywords, {scanner.patterns} patterns, {mode})")
+        _danger_scanner = scanner
+    return _danger_scanner
+
 class CommandInterpreter:
-    def __init__(self, provider, client, model):
+    def __init__(self, provider, client, model, async_client=None, intent_cache: Optional[IntentCache] = None,
+                 lexical_threshold: float = LEXICAL_CONFIDENCE_THRESHOLD):
         self.provider = provider
         self.client = client
+        self.async_client = async_client
         self.model = model
+        self.intent_cache = intent_cache if intent_cache is not None else get_intent_cache()
+        self.classifier = LexicalIntentClassifier()
+        self.lexical_threshold = lexical_threshold
         
         # --- Level 1: Syntax Safety Rules ---
-        self.DANGER_KEYWORDS = {
-            "critical": [
-                "explode", "detonate", "suicide", "jump off", "burn", "fire", 
-                "short circuit", "lick", "eat", "drink poison", "remove helmet", "open airlock"
-            ],
-            "high": [
-                "break", "smash", "destroy", "steal", "attack", "cut wire"
-            ]
-        }
+        self.DANGER_KEYWORDS = DANGER_KEYWORDS
+        self.danger_scanner = get_danger_scanner()
 
     def analyze_intent(self, user_input: str, context: Dict) -> Dict:
         """
@@ -49,52 +412,111 @@ class CommandInterpreter:
         """
         # 1. Level 1: Keyword Check (Fast Fail)
         keyword_safety = self._check_dangerous_keywords(user_input)
+        blocked = self._block_critical(keyword_safety)
+        if blocked:
+            return blocked
+
+        # 2. Level 2: Semantic Analysis (lexical fast path -> cache -> LLM)
+        intent = self._resolve_locally(user_input, context)
+        if intent is None:
+            intent = self._parse_semantic_llm(user_input, context)
+            self.intent_cache.put(user_input, context, intent)
+        
+        # 3. Level 3: Contextual Safety Check
+        return self._finalize(intent, context, keyword_safety)
+
+    async def aanalyze_intent(self, user_input: str, context: Dict) -> Dict:
+        """
+        Async variant of `analyze_intent` (same three levels, non-blocking LLM call).
+        """
+        keyword_safety = self._check_dangerous_keywords(user_input)
+        blocked = self._block_critical(keyword_safety)
+        if blocked:
+            return blocked
+
+        intent = self._resolve_locally(user_input, context)
+        if intent is None:
+            intent = await self._aparse_semantic_llm(user_input, context)
+            self.intent_cache.put(user_input, context, intent)
+        return self._finalize(intent, context, keyword_safety)
+
+    def _resolve_locally(self, user_input: str, context: Dict) -> Optional[Dict]:
+        """
+        Level 2 without a network call: confident lexical match first, then the intent cache.
+        Returns None if the LLM has to parse the command (counted as the "llm" path).
+        """
+        intent, confidence = self.classifier.classify(user_input)
+        if intent is not None and confidence >= self.lexical_threshold:
+            intent_path_counts["lexical"] += 1
+            return intent
+
+        intent = self.intent_cache.get(user_input, context)
+        if intent is not None:
+            intent_path_counts["cache"] += 1
+            return intent
+
+        intent_path_counts["llm"] += 1
+        return None
+
+    def screen_keywords(self, user_input: str) -> Optional[Dict]:
+        """Level 1 only. Returns a blocked analysis, or None if the input may proceed."""
+        return self._block_critical(self._check_dangerous_keywords(user_input))
+
+    def _block_critical(self, keyword_safety: Dict) -> Optional[Dict]:
         if keyword_safety["level"] == DangerLevel.CRITICAL:
             return {
                 "is_safe": False,
                 "danger_reason": f"CRITICAL SAFETY VIOLATION: {keyword_safety['reason']}",
                 "intent": None
             }
+        return None
 
-        # 2. Level 2: LLM Semantic Analysis
-        intent = self._parse_semantic_llm(user_input, context)
-        
-        # 3. Level 3: Contextual Safety Check
+    def check_intent(self, user_input: str, intent: Dict, context: Dict) -> Dict:
+        """
+        Runs Level 1 and Level 3 on an intent that was obtained elsewhere
+        (e.g. the combined single-call path), skipping the Level 2 LLM parse.
+        """
+        keyword_safety = self._check_dangerous_keywords(user_input)
+        blocked = self._block_critical(keyword_safety)
+        if blocked:
+            return blocked
+        return self._finalize(intent, context, keyword_safety)
+
+    def _finalize(self, intent: Dict, context: Dict, keyword_safety: Optional[Dict] = None) -> Dict:
         context_safety = self._check_context_safety(intent, context)
         
         if not context_safety["is_safe"]:
-             return {
+             result = {
                 "is_safe": False,
                 "danger_reason": context_safety["reason"],
                 "intent": intent
             }
+        else:
+            result = {
+                "is_safe": True,
+                "danger_reason": None,
+                "intent": intent
+            }
 
-        return {
-            "is_safe": True,
-            "danger_reason": None,
-            "intent": intent
-        }
+        # Non-fatal keyword tiers (e.g. "smash") don't block, but are reported
+        if keyword_safety and keyword_safety["hits"]:
+            result["warnings"] = [f"{hit.tier}: {hit.keyword}" for hit in keyword_safety["hits"]]
+        return result
 
     def _check_dangerous_keywords(self, text: str) -> Dict:
-        text_lower = text.lower()
-        for keyword in self.DANGER_KEYWORDS["critical"]:
-            if keyword in text_lower:
-                return {"level": DangerLevel.CRITICAL, "reason": f"Detected fatal keyword: '{keyword}'"}
-        return {"level": DangerLevel.NONE, "reason": None}
+        # Single pass over the input for every tier (word-boundary aware, so "heater" is not "eat")
+        hits = self.danger_scanner.scan(text)
+        worst = KeywordAutomaton.most_severe(hits)
+        if worst is None:
+            return {"level": DangerLevel.NONE, "reason": None, "hits": []}
+        if worst.tier == "critical":
+            return {"level": DangerLevel.CRITICAL, "reason": f"Detected fatal keyword: '{worst.keyword}'", "hits": hits}
+        return {"level": DangerLevel(worst.tier), "reason": f"Detected risky keyword: '{worst.keyword}'", "hits": hits}
 
-    def _parse_semantic_llm(self, text: str, context: Dict) -> Dict:
-        """
-        Uses LLM to parse intent into structured JSON.
-        """
-        schema = """
-        {
-            "action": "move|interact|use_item|examine|communicate|wait|unknown",
-            "target": "target_object_name_or_id",
-            "parameters": { "type": "press|pull|open|etc", ... }
-        }
-        """
+    def _build_intent_prompt(self, text: str, context: Dict) -> str:
+        schema = INTENT_SCHEMA
         
-        prompt = f"""
+        return f"""
         Analyze the following player command for a Mars Survival Game.
         Context: {json.dumps(context.get('telemetry', {}))}
         Command: "{text}"
@@ -102,9 +524,15 @@ class CommandInterpreter:
         Return ONLY a JSON object matching this schema:
         {schema}
         """
+
+    def _parse_semantic_llm(self, text: str, context: Dict) -> Dict:
+        """
+        Uses LLM to parse intent into structured JSON.
+        """
+        prompt = self._build_intent_prompt(text, context)
         
         try:
-            # Call LLM (Synchronous for MVP, should be async in prod)
+            # Synchronous path (CLI / verify scripts). The server uses _aparse_semantic_llm.
             if self.provider == "openai":
                 response = self.client.chat.completions.create(
                     model=self.model,
@@ -114,23 +542,71 @@ class CommandInterpreter:
                 )
                 content = response.choices[0].message.content
             elif self.provider == "google":
-                model_instance = self.client.GenerativeModel(self.model)
+                model_instance = get_model_registry().google_model(self.client, self.model)
                 response = model_instance.generate_content(prompt)
                 content = response.text
             else:
                 return {"action": "unknown"}
 
-            # Clean markdown code blocks if present
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-                
-            return json.loads(content)
+            return self._extract_json(content)
         except Exception as e:
             print(f"[MIDDLEWARE] LLM Parse Error: {e}")
             return {"action": "unknown"}
 
+    async def _aparse_semantic_llm(self, text: str, context: Dict) -> Dict:
+        """
+        Async variant of `_parse_semantic_llm` using the provider's async client,
+        bounded by the shared per-provider limiter. With CARGO_INTENT_BATCH=1 the parse
+        first joins a cross-session batch and only makes its own call if that fails.
+        """
+        if self.provider not in ("openai", "google") or self.async_client is None:
+            return {"action": "unknown"}
+
+        batcher = get_intent_batcher(self.provider, self.model) if INTENT_BATCHING else None
+        if batcher is not None:
+            intent = await batcher.parse(self, text, context)
+            if intent is not None:
+                return intent
+
+        prompt = self._build_intent_prompt(text, context)
+        # Sessions on the same scenario often parse the same command at once: share one call
+        key = request_key(self.provider, self.model, self._intent_messages(prompt), response_format="json_object")
+        try:
+            with batcher.busy() if batcher is not None else nullcontext():
+                content = await get_single_flight().run(key, lambda: get_limiter(self.provider).run(self._acall(prompt)))
+            return self._extract_json(content)
+        except asyncio.TimeoutError:
+            print("[MIDDLEWARE] LLM Parse Timeout")
+            return {"action": "unknown"}
+        except Exception as e:
+            print(f"[MIDDLEWARE] LLM Parse Error: {e}")
+            return {"action": "unknown"}
+
+    def _intent_messages(self, prompt: str) -> List[Dict]:
+        return [{"role": "system", "content": "You are a JSON parser."},
+                {"role": "user", "content": prompt}]
+
+    async def _acall(self, prompt: str) -> str:
+        if self.provider == "openai":
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=self._intent_messages(prompt),
+                response_format={"type": "json_object"}
+            )
+            return response.choices[0].message.content
+        model_instance = get_model_registry().google_model(self.async_client, self.model)
+        response = await model_instance.generate_content_async(prompt)
+        return response.text
+
+    def _extract_json(self, content: str) -> Dict:
+        # Clean markdown code blocks if present
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
+            
+        return json.loads(content)
+
     def _check_context_safety(self, intent: Dict, context: Dict) -> Dict:
         """
         Level 3: Checks if the action is safe GIVEN the current state.
@@ -0,0 +1,80 @@
+"""
+@file bench_keyword_scanner.py
+@description Micro-benchmark: Aho-Corasick keyword scanner vs. the legacy per-keyword substring loop.
+@module AIInterpreter
+
+Usage: python -m MVP.bench_keyword_scanner [--patterns 5000] [--iterations 20000]
+"""
+
+import argparse
+import random
+import string
+import time
+from MVP.ai_middleware import DANGER_KEYWORDS
+from MVP.keyword_scanner import AUTOMATON_MIN_PATTERNS, KeywordAutomaton
+
+SAMPLE_INPUTS = [
+    "search the shelf",
+    "Jack, check the heater and tell me what the display says",
+    "tape the square filter onto the round scrubber slot using the hose as a seal",
+    "please do not remove helmet until the CO2 level drops below one percent",
+    "look around the room and describe everything you see, especially anything shiny",
+]
+
+def legacy_scan(keywords, text: str):
+    """The original `_check_dangerous_keywords` loop (critical tier only, substring match)."""
+    text_lower = text.lower()
+    for keyword in keywords:
+        if keyword in text_lower:
+            return keyword
+    return None
+
+def synthetic_keywords(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 12))))
+    return sorted(words)
+
+def bench(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(SAMPLE_INPUTS[i % len(SAMPLE_INPUTS)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patterns", type=int, default=5000, help="synthetic patterns added on top of DANGER_KEYWORDS")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'keywords':>9} | {'patterns':>8} | {'legacy loop (us)':>17} | {'scanner loop (us)':>18} | "
+          f"{'automaton (us)':>15} | {'build (ms)':>10}")
+    crossover = None
+    for extra in sorted({0, 10, 30, 100, 150, 300, 1000, args.patterns // 10, args.patterns}):
+        legacy_keywords = DANGER_KEYWORDS["critical"] + synthetic_keywords(extra)
+
+        start = time.perf_counter()
+        automaton = KeywordAutomaton(DANGER_KEYWORDS, min_automaton_patterns=0)
+        for keyword in legacy_keywords[len(DANGER_KEYWORDS["critical"]):]:
+            automaton.add(keyword, "critical")
+        automaton.build()
+        build_ms = (time.perf_counter() - start) * 1e3
+        patterns = automaton.patterns
+
+        looped = KeywordAutomaton(DANGER_KEYWORDS, min_automaton_patterns=patterns + 1)
+        for keyword in legacy_keywords[len(DANGER_KEYWORDS["critical"]):]:
+            looped.add(keyword, "critical")
+
+        legacy_us = bench(lambda text: legacy_scan(legacy_keywords, text), args.iterations)
+        loop_us = bench(looped.scan, args.iterations)
+        automaton_us = bench(automaton.scan, args.iterations)
+        if crossover is None and automaton_us < loop_us:
+            crossover = patterns
+        print(f"{automaton.size:>9} | {patterns:>8} | {legacy_us:>17.2f} | {loop_us:>18.2f} | "
+              f"{automaton_us:>15.2f} | {build_ms:>10.1f}")
+    print(f"\nautomaton faster than the scanner loop from ~{crossover} patterns "
+          f"(AUTOMATON_MIN_PATTERNS = {AUTOMATON_MIN_PATTERNS})")
+
+if __name__ == "__main__":
+    main()
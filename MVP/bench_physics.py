@@ -0,0 +1,231 @@
+"""
+@file bench_physics.py
+@description Headless physics benchmark: ticks/sec, per-subsystem time, memory and allocations, JSON for regression checks.
+@module PhysicsSimulation
+
+Usage: python -m MVP.bench_physics [--ticks 100000] [--scenarios default,co2_crisis] [--modes physics,engine,server]
+                                   [--json results.json] [--compare baseline.json --threshold 10]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict
+from MVP.state_schema import GameState, Breach
+from MVP.physics_engine import PhysicsSimulator
+
+SUBSYSTEMS = ["update_environment", "update_power_system", "update_jack_physiology", "translate"]
+
+# --- Scenarios (initial states) ---
+
+def scenario_default() -> GameState:
+    return GameState()
+
+def scenario_co2_crisis() -> GameState:
+    from MVP.scenario_manager import ScenarioManager
+    state = GameState()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ScenarioManager(state).load_scenario("co2_crisis")
+    return state
+
+def scenario_blackout() -> GameState:
+    state = GameState()
+    state.power_system.solar_panels.online = False
+    state.power_system.backup_battery.capacity_wh = 50.0
+    return state
+
+def scenario_breach() -> GameState:
+    state = GameState()
+    state.environment.breaches = [Breach(id="b1", location="airlock seal", size_mm=2.0, is_sealed=False)]
+    state.life_support.heater.status = False
+    return state
+
+SCENARIOS: Dict[str, Callable[[], GameState]] = {
+    "default": scenario_default,
+    "co2_crisis": scenario_co2_crisis,
+    "blackout": scenario_blackout,
+    "breach": scenario_breach,
+}
+
+# --- Runners: each returns a zero-argument callable that advances one tick ---
+
+def make_physics(state: GameState):
+    sim = PhysicsSimulator(state)
+    return sim, lambda: sim.simulation_step(1.0)
+
+def _engine(state: GameState):
+    from MVP.main import GameEngine
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = GameEngine()
+    engine.state = state
+    engine.physics = PhysicsSimulator(state)
+    return engine
+
+def make_engine(state: GameState):
+    engine = _engine(state)
+    return engine.physics, lambda: engine.tick(1.0)
+
+def make_server(state: GameState):
+    """Engine tick as the server's physics loop runs it: no sensory text unless a client reads it."""
+    engine = _engine(state)
+    return engine.physics, lambda: engine.tick(1.0, include_sensory=False)
+
+MODES = {
+    "physics": make_physics,
+    "engine": make_engine,
+    "server": make_server,
+}
+
+def _timed(fn, totals: Dict[str, float], name: str):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            totals[name] += time.perf_counter() - start
+    return wrapper
+
+def bench_throughput(mode: str, scenario: str, ticks: int) -> Dict:
+    _, tick = MODES[mode](SCENARIOS[scenario]())
+    gc_before = sum(s["collections"] for s in gc.get_stats())
+    start = time.perf_counter()
+    for _ in range(ticks):
+        tick()
+    elapsed = time.perf_counter() - start
+    return {
+        "ticks": ticks,
+        "seconds": round(elapsed, 4),
+        "ticks_per_sec": round(ticks / elapsed, 1),
+        "us_per_tick": round(elapsed / ticks * 1e6, 3),
+        "gc_collections": sum(s["collections"] for s in gc.get_stats()) - gc_before,
+    }
+
+def bench_subsystems(mode: str, scenario: str, ticks: int) -> Dict[str, float]:
+    """Average microseconds per tick spent in each subsystem (separate pass: wrapping adds overhead)."""
+    sim, tick = MODES[mode](SCENARIOS[scenario]())
+    totals = {name: 0.0 for name in SUBSYSTEMS}
+    for name in SUBSYSTEMS[:3]:
+        setattr(sim, name, _timed(getattr(sim, name), totals, name))
+    translator = sim.sensory_translator
+    translator.translate = _timed(translator.translate, totals, "translate")
+    for _ in range(ticks):
+        tick()
+    return {name: round(total / ticks * 1e6, 3) for name, total in totals.items()}
+
+def bench_memory(mode: str, scenario: str, ticks: int) -> Dict:
+    """Peak traced memory and blocks still allocated after `ticks` ticks (leak indicator)."""
+    _, tick = MODES[mode](SCENARIOS[scenario]())
+    tick() # Warm up lazily created objects
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(ticks):
+        tick()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    return {
+        "peak_kib": round(peak / 1024, 1),
+        "retained_blocks": sum(stat.count_diff for stat in diff),
+        "retained_kib": round(sum(stat.size_diff for stat in diff) / 1024, 1),
+    }
+
+def bench_fast_forward(scenario: str, seconds: float) -> Dict:
+    sim = PhysicsSimulator(SCENARIOS[scenario]())
+    start = time.perf_counter()
+    result = sim.fast_forward(seconds)
+    elapsed = time.perf_counter() - start
+    return {
+        "simulated_seconds": seconds,
+        "ms": round(elapsed * 1e3, 3),
+        "segments": result.segments,
+        "events": len(result.events),
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> bool:
+    """Prints throughput changes vs. a baseline file. Returns False if any case regressed past `threshold` %."""
+    ok = True
+    print(f"\nvs. baseline {baseline.get('meta', {}).get('commit', '?')}:")
+    for case, current in results["results"].items():
+        previous = baseline.get("results", {}).get(case)
+        if not previous or "ticks_per_sec" not in previous:
+            continue
+        change = (current["ticks_per_sec"] / previous["ticks_per_sec"] - 1.0) * 100
+        flag = ""
+        if change < -threshold:
+            flag, ok = "  REGRESSION", False
+        print(f"  {case:<24} {previous['ticks_per_sec']:>12,.0f} -> {current['ticks_per_sec']:>12,.0f} ticks/s ({change:+.1f}%){flag}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=100000, help="ticks per throughput run")
+    parser.add_argument("--profile-ticks", type=int, default=20000, help="ticks for the subsystem and memory passes")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--fast-forward", type=float, default=7200.0, help="simulated seconds for the fast-forward run (0 = skip)")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON from a previous run")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed ticks/sec drop in %% before failing")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "ticks": args.ticks,
+        },
+        "results": {}
+    }
+
+    print(f"{'case':<24} | {'ticks/s':>12} | {'us/tick':>8} | " + " | ".join(f"{n[:14]:>14}" for n in SUBSYSTEMS)
+          + f" | {'peak KiB':>8} | {'retained':>8}")
+    for mode in args.modes.split(","):
+        for scenario in args.scenarios.split(","):
+            case = f"{mode}/{scenario}"
+            entry = bench_throughput(mode, scenario, args.ticks)
+            entry["subsystems_us"] = bench_subsystems(mode, scenario, args.profile_ticks)
+            entry.update(bench_memory(mode, scenario, args.profile_ticks))
+            results["results"][case] = entry
+            print(f"{case:<24} | {entry['ticks_per_sec']:>12,.0f} | {entry['us_per_tick']:>8.2f} | "
+                  + " | ".join(f"{entry['subsystems_us'][n]:>14.2f}" for n in SUBSYSTEMS)
+                  + f" | {entry['peak_kib']:>8.1f} | {entry['retained_blocks']:>8}")
+
+    if args.fast_forward:
+        for scenario in args.scenarios.split(","):
+            entry = bench_fast_forward(scenario, args.fast_forward)
+            results["results"][f"fast_forward/{scenario}"] = entry
+            print(f"fast_forward/{scenario:<11} | {entry['simulated_seconds']:.0f} s simulated in {entry['ms']:.3f} ms "
+                  f"({entry['segments']} segments, {entry['events']} events)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
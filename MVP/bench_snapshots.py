@@ -0,0 +1,94 @@
+"""
+@file bench_snapshots.py
+@description Micro-benchmark: sectioned habitat snapshots vs. whole-state Pydantic model_dump_json / model_validate_json.
+@module PhysicsSimulation
+
+Usage: python -m MVP.bench_snapshots [--iterations 5000] [--sessions 5000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from MVP.state_schema import GameState
+from MVP.physics_engine import PhysicsSimulator
+from MVP.scenario_manager import ScenarioManager
+from MVP.snapshots import CheckpointRing, Snapshot, capture, restore_state, save_snapshots, load_snapshots
+
+def mid_game_state():
+    """co2_crisis after ten minutes, with the shelf already searched."""
+    state = GameState()
+    scenarios = ScenarioManager(state)
+    with contextlib.redirect_stdout(io.StringIO()):
+        scenarios.load_scenario("co2_crisis")
+    scenarios.process_action({"action": "search", "target": "shelf"})
+    physics = PhysicsSimulator(state)
+    for _ in range(600):
+        physics.advance(1.0)
+    return physics, scenarios
+
+def per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=5000, help="sessions in the store save/load run")
+    args = parser.parse_args()
+
+    physics, scenarios = mid_game_state()
+    state = physics.sync()
+    progress = scenarios.progress()
+    snapshot = capture(state, physics.hot.previous_temperature, progress)
+    blob = snapshot.to_bytes()
+    json_text = state.model_dump_json()
+
+    # 1. Single habitat: encode, decode, size
+    rows = [
+        ("model_dump_json", per_call_us(state.model_dump_json, args.iterations), len(json_text)),
+        ("snapshot encode", per_call_us(lambda: capture(state, physics.hot.previous_temperature, progress).to_bytes(), args.iterations), len(blob)),
+        ("model_validate_json", per_call_us(lambda: GameState.model_validate_json(json_text), args.iterations), None),
+        ("snapshot decode", per_call_us(lambda: restore_state(Snapshot.from_bytes(blob)), args.iterations), None),
+    ]
+    print(f"{'operation':<20} | {'us/call':>8} | {'calls/s':>10} | {'bytes':>6}")
+    for name, us, size in rows:
+        print(f"{name:<20} | {us:>8.2f} | {1e6 / us:>10,.0f} | {size if size is not None else '':>6}")
+    print("(the snapshot also carries puzzle progress; JSON is the GameState alone)")
+
+    # 2. Copy-on-write checkpoints: one per minute over an hour of play
+    ring = CheckpointRing(limit=60)
+    for _ in range(60):
+        for _ in range(60):
+            physics.advance(1.0)
+        ring.add(capture(physics.sync(), physics.hot.previous_temperature, progress, ring.latest()))
+    stats = ring.stats()
+    print(f"\ncheckpoints: {stats['checkpoints']} held in {stats['bytes']:,} bytes "
+          f"({stats['unshared_bytes']:,} without sharing, {len(json_text) * 60:,} as JSON)")
+
+    # 3. Session store: save and restore N habitats
+    blobs = {f"session-{i}": blob for i in range(args.sessions)}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sessions.bin")
+        start = time.perf_counter()
+        save_snapshots(path, blobs)
+        save_ms = (time.perf_counter() - start) * 1e3
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        loaded = load_snapshots(path)
+        load_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        for data in loaded.values():
+            restore_state(Snapshot.from_bytes(data))
+        decode_ms = (time.perf_counter() - start) * 1e3
+    print(f"\nstore: {args.sessions:,} sessions, {size / 1024:,.0f} KiB | save {save_ms:.1f} ms | "
+          f"load (dormant) {load_ms:.1f} ms | decode all {decode_ms:.1f} ms")
+
+if __name__ == "__main__":
+    main()
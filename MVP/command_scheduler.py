@@ -0,0 +1,144 @@
+"""
+@file command_scheduler.py
+@description Per-session command scheduling: queue, replace-latest or reject-while-busy, with cancellation.
+@module APIServer
+"""
+
+import os
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+DEFAULT_COMMAND_POLICY = os.environ.get("CARGO_COMMAND_POLICY", "queue")
+DEFAULT_COMMAND_QUEUE_SIZE = int(os.environ.get("CARGO_COMMAND_QUEUE_SIZE", "8"))
+
+COMMAND_POLICIES = ("queue", "replace_latest", "reject")
+
+# Why a command was dropped (sent to the client in a CANCELLED frame)
+BUSY = "busy"
+QUEUE_FULL = "queue_full"
+SUPERSEDED = "superseded"
+DISCONNECTED = "disconnected"
+
+DropCallback = Callable[[str, bool], Any] # (reason, whether the command had started)
+ErrorCallback = Callable[[BaseException], Any]
+
+class CommandScheduler:
+    """
+    Runs one session's commands one at a time, as background tasks, so the socket keeps
+    reading while Jack thinks. What happens to a command that arrives while another runs
+    depends on the policy:
+      - `queue`:          it waits its turn (at most `max_queue` waiting, the rest are dropped).
+      - `replace_latest`: the running command is cancelled and anything waiting is dropped;
+                          the newest command runs next. The cancellation reaches the awaited
+                          LLM request, so a superseded reply is never paid for in full.
+      - `reject`:         it is dropped while the session is busy.
+    Every dropped or cancelled command gets its `on_drop(reason, started)` callback, and a
+    command that raises gets `on_error(exception)`, so the client is never left waiting.
+    """
+    def __init__(self, policy: str = DEFAULT_COMMAND_POLICY, max_queue: int = DEFAULT_COMMAND_QUEUE_SIZE):
+        if policy not in COMMAND_POLICIES:
+            raise ValueError(f"Unknown command policy '{policy}' (expected one of {COMMAND_POLICIES})")
+        self.policy = policy
+        self.max_queue = max_queue
+        self._waiting: Deque[Tuple[Callable[[], Awaitable], Optional[DropCallback], Optional[ErrorCallback], Any]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._task_drop: Optional[DropCallback] = None
+        self._task_error: Optional[ErrorCallback] = None
+        self._task_owner: Any = None
+        self._cancel_reason = SUPERSEDED
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0  # Stopped while running
+        self.dropped = 0    # Never started (rejected, superseded while waiting, queue full)
+
+    @property
+    def busy(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, command: Callable[[], Awaitable], on_drop: Optional[DropCallback] = None,
+               owner: Any = None, on_error: Optional[ErrorCallback] = None) -> bool:
+        """
+        Schedules `command()` (a coroutine factory). `owner` tags it for `cancel_owner`.
+        Returns False if the command was dropped right away.
+        """
+        self.submitted += 1
+        if self.policy == "reject" and (self.busy or self._waiting):
+            self._drop(on_drop, BUSY)
+            return False
+        if self.policy == "replace_latest":
+            while self._waiting:
+                _, dropped_cb, _, _ = self._waiting.popleft()
+                self._drop(dropped_cb, SUPERSEDED)
+            if self.busy:
+                self._cancel_current(SUPERSEDED)
+        elif len(self._waiting) >= self.max_queue:
+            self._drop(on_drop, QUEUE_FULL)
+            return False
+
+        self._waiting.append((command, on_drop, on_error, owner))
+        if not self.busy:
+            self._start_next()
+        return True
+
+    def cancel_owner(self, owner: Any):
+        """Drops everything `owner` submitted (e.g. its socket closed) and cancels its running command."""
+        kept = deque()
+        for entry in self._waiting:
+            if entry[3] is owner:
+                self._drop(entry[1], DISCONNECTED)
+            else:
+                kept.append(entry)
+        self._waiting = kept
+        if self.busy and self._task_owner is owner:
+            self._cancel_current(DISCONNECTED)
+
+    def _cancel_current(self, reason: str):
+        self._cancel_reason = reason
+        self._task.cancel()
+
+    def _drop(self, on_drop: Optional[DropCallback], reason: str):
+        self.dropped += 1
+        if on_drop is not None:
+            on_drop(reason, False)
+
+    def _start_next(self):
+        if not self._waiting:
+            self._task = None
+            return
+        command, on_drop, on_error, owner = self._waiting.popleft()
+        self._task_drop, self._task_error, self._task_owner = on_drop, on_error, owner
+        self._task = asyncio.create_task(command())
+        self._task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        if task is not self._task:
+            return
+        if task.cancelled():
+            self.cancelled += 1
+            if self._task_drop is not None:
+                self._task_drop(self._cancel_reason, True)
+        elif task.exception() is not None:
+            self.failed += 1
+            print(f"[COMMANDS] Command failed: {task.exception()}")
+            if self._task_error is not None:
+                self._task_error(task.exception())
+        else:
+            self.completed += 1
+        self._cancel_reason = SUPERSEDED
+        self._start_next()
+
+    def stats(self) -> Dict:
+        return {
+            "policy": self.policy,
+            "busy": self.busy,
+            "waiting": len(self._waiting),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "dropped": self.dropped
+        }
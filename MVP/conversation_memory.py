@@ -0,0 +1,109 @@
+"""
+@file conversation_memory.py
+@description Bounded per-session conversation memory: recent turns verbatim, older turns rolled into a summary.
+@module PersonaManagement
+"""
+
+import os
+import re
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
+from MVP.prompts import estimate_tokens
+
+DEFAULT_MEMORY_TURNS = int(os.environ.get("CARGO_CHAT_HISTORY_TURNS", "6"))
+DEFAULT_MEMORY_TOKEN_BUDGET = int(os.environ.get("CARGO_MEMORY_TOKEN_BUDGET", "800"))
+DEFAULT_SUMMARY_TOKENS = int(os.environ.get("CARGO_MEMORY_SUMMARY_TOKENS", "200"))
+
+# Hard cap per stored message, so a single rambling turn cannot blow the budget
+MAX_MESSAGE_CHARS = 600
+
+class Turn(NamedTuple):
+    command: str
+    reply: str
+    event: Optional[str] = None # Scripted ACTION RESULT, if the command did something
+
+def _clip(text: str, limit: int) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+def _first_sentence(text: str) -> str:
+    match = re.search(r"[.!?](\s|$)", text)
+    return text[:match.end()].strip() if match else text
+
+class ConversationMemory:
+    """
+    What Jack remembers of the current call with the dispatcher.
+
+    The last `max_turns` exchanges are kept verbatim and replayed as chat history.
+    Older exchanges are folded into a one-line-per-turn summary (command -> outcome),
+    and the oldest summary lines are dropped once it exceeds `summary_tokens`.
+    Verbatim turns are rolled early whenever the whole memory exceeds `token_budget`,
+    so the prompt stays the same size no matter how long the session runs.
+    Summarization is extractive: it costs no extra LLM call.
+    """
+    def __init__(self,
+                 max_turns: int = DEFAULT_MEMORY_TURNS,
+                 token_budget: int = DEFAULT_MEMORY_TOKEN_BUDGET,
+                 summary_tokens: int = DEFAULT_SUMMARY_TOKENS):
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.turns: Deque[Turn] = deque()
+        self.summary_lines: Deque[str] = deque()
+        self.omitted = 0
+        self.total_turns = 0
+
+    def add(self, command: str, reply: str, event: Optional[str] = None):
+        self.turns.append(Turn(_clip(command, MAX_MESSAGE_CHARS), _clip(reply, MAX_MESSAGE_CHARS), event))
+        self.total_turns += 1
+        while self.turns and (len(self.turns) > self.max_turns or self.tokens() > self.token_budget):
+            self._roll(self.turns.popleft())
+
+    def _roll(self, turn: Turn):
+        outcome = turn.event or _first_sentence(turn.reply)
+        self.summary_lines.append(f"- Dispatcher: \"{_clip(turn.command, 60)}\" -> {_clip(outcome, 90)}")
+        while self.summary_lines and estimate_tokens(self.summary()) > self.summary_tokens:
+            self.summary_lines.popleft()
+            self.omitted += 1
+
+    def summary(self) -> str:
+        """Summary of everything older than the verbatim window ("" if nothing was rolled)."""
+        if not self.summary_lines:
+            return ""
+        lines = list(self.summary_lines)
+        if self.omitted:
+            lines.insert(0, f"({self.omitted} earlier exchanges forgotten)")
+        return "\n".join(lines)
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Verbatim turns as provider-neutral chat messages (role: user / assistant)."""
+        messages = []
+        for turn in self.turns:
+            messages.append({"role": "user", "content": turn.command})
+            messages.append({"role": "assistant", "content": turn.reply})
+        return messages
+
+    def transcript(self) -> str:
+        """Summary plus verbatim turns as plain text, for stateless calls that carry no chat history."""
+        lines = [self.summary()] if self.summary_lines else []
+        for turn in self.turns:
+            lines.append(f"Dispatcher: {turn.command}\nJack: {turn.reply}")
+        return "\n".join(lines)
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary()) + sum(
+            estimate_tokens(t.command) + estimate_tokens(t.reply) for t in self.turns
+        )
+
+    def clear(self):
+        self.turns.clear()
+        self.summary_lines.clear()
+        self.omitted = 0
+
+    def stats(self) -> Dict:
+        return {
+            "turns": self.total_turns,
+            "verbatim": len(self.turns),
+            "summary_lines": len(self.summary_lines),
+            "tokens": self.tokens()
+        }
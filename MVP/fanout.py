@@ -0,0 +1,118 @@
+"""
+@file fanout.py
+@description Per-client bounded send queues with dedicated writer tasks (serialize once, never block the tick).
+@module APIServer
+"""
+
+import os
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+DEFAULT_QUEUE_SIZE = int(os.environ.get("CARGO_CLIENT_QUEUE_SIZE", "32"))
+
+# Frame kinds. Telemetry is disposable (newest wins); everything else must be delivered.
+TELEMETRY = "telemetry"
+RELIABLE = "reliable"
+
+class ClientChannel:
+    """
+    Wraps one WebSocket with a bounded outbound queue drained by its own writer task.
+
+    Frames are pre-serialized strings, so a broadcast serializes once and every
+    channel just enqueues the same object.
+    - A new telemetry frame replaces any telemetry frame still waiting (newest wins).
+    - If the queue is full, a waiting telemetry frame is dropped to make room.
+    - Dropping telemetry breaks the delta chain, so the channel raises `needs_resync`
+      and the broadcaster sends it a keyframe next.
+    - If the queue is full of reliable frames the client is hopelessly behind and is closed.
+    """
+    def __init__(self, websocket, max_queue: int = DEFAULT_QUEUE_SIZE):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.queue: Deque[Tuple[str, str]] = deque()
+        self.needs_resync = False
+        self.closed = False
+
+        # Counters
+        self.sent_frames = 0
+        self.dropped_frames = 0
+        self.max_depth = 0
+
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def close(self):
+        self.closed = True
+        self._wakeup.set()
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+            try:
+                await self._writer
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def offer(self, payload: str, kind: str = RELIABLE) -> bool:
+        """Enqueues a serialized frame without blocking. Returns False if it was dropped."""
+        if self.closed:
+            return False
+
+        if kind == TELEMETRY:
+            self._drop_queued_telemetry()
+
+        if len(self.queue) >= self.max_queue:
+            if kind == TELEMETRY:
+                self._count_drop()
+                return False
+            if not self._drop_queued_telemetry():
+                print("[FANOUT] Client queue overflow, closing slow client")
+                self.closed = True
+                self._wakeup.set()
+                return False
+
+        self.queue.append((kind, payload))
+        self.max_depth = max(self.max_depth, len(self.queue))
+        self._wakeup.set()
+        return True
+
+    def _drop_queued_telemetry(self) -> bool:
+        """Removes waiting telemetry frames (at most one, since offers coalesce)."""
+        stale = [entry for entry in self.queue if entry[0] == TELEMETRY]
+        for entry in stale:
+            self.queue.remove(entry)
+            self._count_drop()
+        return bool(stale)
+
+    def _count_drop(self):
+        self.dropped_frames += 1
+        self.needs_resync = True
+
+    async def _write_loop(self):
+        try:
+            while not self.closed:
+                if not self.queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                _, payload = self.queue.popleft()
+                await self.websocket.send_text(payload)
+                self.sent_frames += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[FANOUT] Writer stopped: {e}")
+        finally:
+            self.closed = True
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": len(self.queue),
+            "max_queue_depth": self.max_depth,
+            "sent_frames": self.sent_frames,
+            "dropped_frames": self.dropped_frames,
+            "closed": self.closed
+        }
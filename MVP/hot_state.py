@@ -0,0 +1,92 @@
+"""
+@file hot_state.py
+@description Compact slotted mirror of the GameState fields the physics tick reads and writes.
+@module PhysicsSimulation
+"""
+
+from typing import Optional
+from MVP.state_schema import GameState
+
+class HotState:
+    """
+    The hot physics variables of one habitat as plain slotted attributes.
+
+    PhysicsSimulator ticks on this object instead of the Pydantic models, so a tick
+    pays neither nested model lookups nor BaseModel.__setattr__. Sync with the GameState only at the
+    boundaries via `load` / `store`.
+    """
+    __slots__ = (
+        # Dynamic state (written every tick)
+        "oxygen", "co2", "temperature", "previous_temperature", "pressure",
+        "battery_wh", "total_load", "bus_online", "heart_rate", "stress",
+        "simulation_tick", "game_time",
+        # Equipment configuration (read-only inside the tick)
+        "scrubber_on", "scrub_rate", "scrubber_draw",
+        "o2_gen_on", "o2_output_rate", "o2_gen_draw",
+        "heater_on", "heater_watts", "heater_draw",
+        "fan_on", "fan_draw",
+        "solar_online", "solar_watts",
+        "open_breaches",
+    )
+
+    @classmethod
+    def from_state(cls, state: GameState, previous_temperature: Optional[float] = None) -> "HotState":
+        hot = cls()
+        hot.load(state, previous_temperature)
+        return hot
+
+    def load(self, state: GameState, previous_temperature: Optional[float] = None):
+        """
+        Copies every mirrored field from the GameState.
+        `previous_temperature` defaults to the current temperature (true after any step).
+        """
+        env = state.environment
+        power = state.power_system
+        ls = state.life_support
+        jack = state.jack
+
+        self.oxygen = env.oxygen_level
+        self.co2 = env.co2_level
+        self.temperature = env.temperature
+        self.previous_temperature = env.temperature if previous_temperature is None else previous_temperature
+        self.pressure = env.pressure
+        self.open_breaches = sum(1 for br in env.breaches if not br.is_sealed)
+
+        self.battery_wh = power.backup_battery.capacity_wh
+        self.total_load = power.total_load
+        self.bus_online = power.main_bus.online
+        self.solar_online = power.solar_panels.online
+        self.solar_watts = power.solar_panels.output_watts
+
+        self.scrubber_on = ls.co2_scrubber.status == "on"
+        self.scrub_rate = ls.co2_scrubber.scrub_rate
+        self.scrubber_draw = ls.co2_scrubber.power_draw
+        self.o2_gen_on = ls.o2_generator.status == "on"
+        self.o2_output_rate = ls.o2_generator.output_rate
+        self.o2_gen_draw = ls.o2_generator.power_draw
+        self.heater_on = bool(ls.heater.status)
+        self.heater_watts = ls.heater.output_watts
+        self.heater_draw = ls.heater.power_draw
+        self.fan_on = bool(ls.air_circulation.status)
+        self.fan_draw = ls.air_circulation.power_draw
+
+        self.heart_rate = jack.vitals.heart_rate
+        self.stress = jack.stress_level
+        self.simulation_tick = state.metadata.simulation_tick
+        self.game_time = state.metadata.game_time_seconds
+
+    def store(self, state: GameState):
+        """Writes the dynamic fields back into the GameState (configuration is never changed by physics)."""
+        env = state.environment
+        power = state.power_system
+        env.oxygen_level = self.oxygen
+        env.co2_level = self.co2
+        env.temperature = self.temperature
+        env.pressure = self.pressure
+        power.backup_battery.capacity_wh = self.battery_wh
+        power.total_load = self.total_load
+        power.main_bus.online = self.bus_online
+        state.jack.vitals.heart_rate = self.heart_rate
+        state.jack.stress_level = self.stress
+        state.metadata.simulation_tick = self.simulation_tick
+        state.metadata.game_time_seconds = self.game_time
@@ -0,0 +1,102 @@
+"""
+@file intent_classifier.py
+@description Deterministic lexical intent classifier that resolves common commands without an LLM call.
+@module AIInterpreter
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Verb groups -> scenario action (see CO2CrisisPuzzle.handle_interaction)
+ACTION_LEXICON: Dict[str, List[str]] = {
+    "examine": ["search", "look", "check", "examine", "inspect", "rummage", "scan", "open", "dig"],
+    "use_item": ["fix", "repair", "patch", "use", "tape", "attach", "install", "seal", "mend"],
+    "combine": ["combine", "assemble", "jury rig", "rig", "put together"],
+}
+
+# Canonical target -> surface forms. Canonical names keep the substrings the puzzle matches on.
+TARGET_LEXICON: Dict[str, List[str]] = {
+    "warehouse shelf": ["warehouse shelf", "shelf", "shelves", "warehouse", "rack"],
+    "locker": ["locker", "lockers", "cabinet"],
+    "co2 scrubber": ["co2 scrubber", "scrubber", "air scrubber", "air filter system"],
+    "filter": ["filter", "cartridge"],
+    "room": ["room", "around", "area", "surroundings", "storage"],
+}
+
+NEGATIONS = {"not", "dont", "don't", "never", "stop", "cancel", "no", "without"}
+QUESTION_WORDS = {"what", "why", "how", "where", "when", "who", "which", "should", "could", "would", "if", "can"}
+
+MAX_CONFIDENT_TOKENS = 8
+
+class LexicalIntentClassifier:
+    """
+    Maps short imperative commands ("search the shelf", "fix the scrubber") to the
+    intent schema in microseconds. Anything ambiguous gets a low confidence and
+    is left to the LLM parser.
+    """
+    def __init__(self):
+        self._actions = self._compile(ACTION_LEXICON)
+        self._targets = self._compile(TARGET_LEXICON)
+
+    @staticmethod
+    def _compile(lexicon: Dict[str, List[str]]) -> List[Tuple[str, "re.Pattern"]]:
+        compiled = []
+        for canonical, forms in lexicon.items():
+            # Longest forms first so "warehouse shelf" wins over "shelf"
+            alternation = "|".join(re.escape(f) for f in sorted(forms, key=len, reverse=True))
+            compiled.append((canonical, re.compile(rf"\b(?:{alternation})\b")))
+        return compiled
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        text = text.lower().replace("’", "'")
+        text = re.sub(r"[^\w\s']", " ", text)
+        return re.sub(r"\s+", " ", text).strip()
+
+    def classify(self, text: str) -> Tuple[Optional[Dict], float]:
+        """Returns (intent, confidence). intent is None when nothing was recognized."""
+        normalized = self._normalize(text)
+        if not normalized:
+            return None, 0.0
+        tokens = normalized.split(" ")
+
+        actions = [(name, m) for name, pattern in self._actions if (m := pattern.search(normalized))]
+        targets = [name for name, pattern in self._targets if pattern.search(normalized)]
+        if not actions:
+            return None, 0.0
+
+        # Earliest verb is the command ("check the tape on the scrubber" -> examine)
+        actions.sort(key=lambda a: a[1].start())
+        action, match = actions[0]
+        confidence = 1.0
+        if len({name for name, _ in actions}) > 1:
+            confidence *= 0.6
+
+        # Repairs name the scrubber and the filter together; the scrubber is the target
+        if "co2 scrubber" in targets and "filter" in targets:
+            targets.remove("filter")
+        if "room" in targets and len(targets) > 1:
+            targets.remove("room")
+
+        if len(targets) == 1:
+            target = targets[0]
+        elif not targets:
+            target = ""
+            confidence *= 0.4
+        else:
+            target = targets[0]
+            confidence *= 0.5
+
+        if NEGATIONS.intersection(tokens):
+            confidence *= 0.3
+        if tokens[0] in QUESTION_WORDS or text.strip().endswith("?"):
+            confidence *= 0.5
+        if len(tokens) > MAX_CONFIDENT_TOKENS:
+            confidence *= 0.7
+
+        intent = {
+            "action": action,
+            "target": target,
+            "parameters": {"type": match.group(0)}
+        }
+        return intent, round(confidence, 3)
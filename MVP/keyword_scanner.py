@@ -0,0 +1,227 @@
+"""
+@file keyword_scanner.py
+@description Aho-Corasick multi-pattern matcher for the Level 1 keyword safety check.
+@module AIInterpreter
+"""
+
+import os
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Severity order, lowest first (matches DangerLevel values in ai_middleware.py)
+TIER_ORDER = ["none", "low", "medium", "high", "critical"]
+
+# Inflections accepted after a keyword ("burn" matches "burning", "eat" never matches "heater")
+SUFFIXES = ("ing", "ous", "es", "ed", "s", "d")
+
+# Below this many patterns (keywords x verb forms) a substring loop beats the automaton in
+# pure Python. Measured crossover with bench_keyword_scanner: ~600 patterns (~140 keywords).
+AUTOMATON_MIN_PATTERNS = int(os.environ.get("CARGO_KEYWORD_AUTOMATON_MIN_PATTERNS", "600"))
+
+# Verb forms no suffix rule produces. Added as extra patterns that report the base keyword.
+IRREGULAR_FORMS: Dict[str, Tuple[str, ...]] = {
+    "eat": ("ate", "eaten"),
+    "burn": ("burnt",),
+    "drink": ("drank", "drunk"),
+    "break": ("broke", "broken"),
+    "steal": ("stole", "stolen"),
+}
+
+_VOWELS = "aeiou"
+
+def verb_forms(word: str) -> Set[str]:
+    """
+    Inflections of a keyword's verb that a trailing suffix can't reach: dropped 'e'
+    ("explode" -> "exploding"), doubled consonant ("cut" -> "cutting"), irregular forms
+    ("eat" -> "ate", "eaten"). Includes `word` itself.
+    """
+    forms = {word}
+    if len(word) < 3:
+        return forms
+    stem = word
+    if word.endswith("e") and not word.endswith("ee"):
+        stem = word[:-1]
+    elif (word[-1] not in _VOWELS + "wxy" and word[-2] in _VOWELS and word[-3] not in _VOWELS
+          and len(re.findall(f"[{_VOWELS}]+", word)) == 1):
+        stem = word + word[-1]
+    forms.update((stem + "ing", stem + "ed"))
+    forms.add(word + ("es" if word.endswith(("s", "sh", "ch", "x", "z")) else "s"))
+    forms.update(IRREGULAR_FORMS.get(word, ()))
+    return forms
+
+def _common_substring(forms: List[str]) -> str:
+    """Longest substring shared by every form (the shortest form, at worst an empty string)."""
+    shortest = min(forms, key=len)
+    for length in range(len(shortest), 0, -1):
+        for start in range(len(shortest) - length + 1):
+            candidate = shortest[start:start + length]
+            if all(candidate in form for form in forms):
+                return candidate
+    return ""
+
+class KeywordHit(NamedTuple):
+    keyword: str
+    tier: str
+    start: int
+    end: int
+
+class KeywordAutomaton:
+    """
+    Compiled once, then scans any input in a single pass regardless of how many
+    patterns are loaded. Below AUTOMATON_MIN_PATTERNS patterns (the shipped list is far
+    below) a substring loop is faster and is used instead, with the same results.
+    Matches respect word boundaries: a keyword must start at a
+    word start and end at a word end (optionally followed by a simple inflection).
+    The leading verb of each keyword is also matched in its other forms (`verb_forms`),
+    so "remove helmet" catches "removing helmet" and "eat" catches "ate".
+    """
+    def __init__(self, tiers: Optional[Dict[str, Iterable[str]]] = None,
+                 min_automaton_patterns: int = AUTOMATON_MIN_PATTERNS):
+        self.min_automaton_patterns = min_automaton_patterns
+        # For the loop: (anchor, [(pattern, keyword, tier)]) per keyword. The anchor is a substring
+        # of every form ("at" for eat/ate/eaten), so one `in` test skips the whole group.
+        self._groups: List[Tuple[str, List[Tuple[str, str, str]]]] = []
+        self.patterns = 0
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[tuple]] = [[]]
+        self._built = False
+        self.size = 0
+        for tier, keywords in (tiers or {}).items():
+            for keyword in keywords:
+                self.add(keyword, tier)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def add(self, keyword: str, tier: str):
+        keyword = self.normalize(keyword).strip()
+        if not keyword:
+            return
+        verb, sep, rest = keyword.partition(" ")
+        forms = sorted(form + sep + rest for form in verb_forms(verb))
+        for form in forms:
+            self._insert(form, keyword, tier)
+        self._groups.append((_common_substring(forms), [(form, keyword, tier) for form in forms]))
+        self.size += 1
+        self._built = False
+
+    @property
+    def uses_automaton(self) -> bool:
+        return self.patterns >= self.min_automaton_patterns
+
+    def _insert(self, pattern: str, keyword: str, tier: str):
+        self.patterns += 1
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((keyword, tier, len(pattern)))
+
+    def load_file(self, path: str, default_tier: str = "critical"):
+        """
+        Loads one keyword per line, optionally prefixed by its tier ("high: smash").
+        Blank lines and '#' comments are ignored.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                tier, sep, keyword = line.partition(":")
+                if sep and tier.strip().lower() in TIER_ORDER:
+                    self.add(keyword, tier.strip().lower())
+                else:
+                    self.add(line, default_tier)
+
+    def build(self):
+        """Computes failure links breadth-first (standard Aho-Corasick construction)."""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+
+    def scan(self, text: str) -> List[KeywordHit]:
+        """Returns every keyword occurrence (all tiers) in `text`, in order of where they end."""
+        text = self.normalize(text)
+        if not self.uses_automaton:
+            return self._scan_loop(text)
+        if not self._built:
+            self.build()
+        hits = []
+        seen = set()
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                end = i + 1
+                for keyword, tier, length in out[node]:
+                    start = end - length
+                    # "exploded" is both a form of "explode" and "explode" + "d": report it once
+                    if (keyword, start) not in seen and self._at_boundary(text, start, end):
+                        seen.add((keyword, start))
+                        hits.append(KeywordHit(keyword, tier, start, end))
+        return hits
+
+    def _scan_loop(self, text: str) -> List[KeywordHit]:
+        found = []
+        for anchor, forms in self._groups:
+            if anchor not in text:
+                continue
+            for pattern, keyword, tier in forms:
+                start = text.find(pattern)
+                while start >= 0:
+                    end = start + len(pattern)
+                    if self._at_boundary(text, start, end):
+                        found.append(KeywordHit(keyword, tier, start, end))
+                    start = text.find(pattern, start + 1)
+        if len(found) < 2:
+            return found
+        # Same order and de-duplication as the automaton: by end, first match per (keyword, start)
+        found.sort(key=lambda hit: hit.end)
+        hits = []
+        seen = set()
+        for hit in found:
+            if (hit.keyword, hit.start) not in seen:
+                seen.add((hit.keyword, hit.start))
+                hits.append(hit)
+        return hits
+
+    @staticmethod
+    def _at_boundary(text: str, start: int, end: int) -> bool:
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        if end == len(text) or not text[end].isalnum():
+            return True
+        for suffix in SUFFIXES:
+            tail = end + len(suffix)
+            if text.startswith(suffix, end) and (tail == len(text) or not text[tail].isalnum()):
+                return True
+        return False
+
+    @staticmethod
+    def most_severe(hits: List[KeywordHit]) -> Optional[KeywordHit]:
+        if not hits:
+            return None
+        return max(hits, key=lambda h: TIER_ORDER.index(h.tier) if h.tier in TIER_ORDER else 0)
@@ -0,0 +1,99 @@
+"""
+@file llm_clients.py
+@description Long-lived provider clients and model objects, shared by every session.
+@module AIInterpreter
+"""
+
+import os
+import json
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MODEL_CACHE_SIZE = int(os.environ.get("CARGO_MODEL_CACHE_SIZE", "32"))
+DEFAULT_HTTP_MAX_CONNECTIONS = int(os.environ.get("CARGO_HTTP_MAX_CONNECTIONS", "100"))
+DEFAULT_HTTP_KEEPALIVE = int(os.environ.get("CARGO_HTTP_MAX_KEEPALIVE", "20"))
+
+class ModelRegistry:
+    """
+    Process-wide registry of provider clients and model objects.
+
+    - Google: `genai.configure()` resets the library's transport clients, so it is called
+      once per API key instead of once per engine. `GenerativeModel` objects are cached by
+      (model, system instruction, generation config) in a small LRU.
+    - OpenAI: one sync/async client pair per (api_key, base_url), each on a pooled
+      keep-alive HTTP client, so sessions reuse warm TLS connections.
+    """
+    def __init__(self, max_models: int = DEFAULT_MODEL_CACHE_SIZE):
+        self.max_models = max_models
+        self._genai = None
+        self._google_key: Optional[str] = None
+        self._models: "OrderedDict[tuple, object]" = OrderedDict()
+        self._openai: Dict[tuple, Tuple[object, object]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def google(self, api_key: str):
+        """Returns the configured `google.generativeai` module, configuring it only on key change."""
+        if self._genai is None or api_key != self._google_key:
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            self._genai = genai
+            self._google_key = api_key
+            self._models.clear()
+        return self._genai
+
+    def google_model(self, genai, model_name: str,
+                     system_instruction: Optional[str] = None,
+                     generation_config: Optional[Dict] = None):
+        """Shared `GenerativeModel`. Model objects are stateless; chats are created per session."""
+        key = (model_name, system_instruction, json.dumps(generation_config, sort_keys=True))
+        model = self._models.get(key)
+        if model is not None:
+            self._models.move_to_end(key)
+            self.hits += 1
+            return model
+
+        self.misses += 1
+        kwargs = {"model_name": model_name}
+        if system_instruction is not None:
+            kwargs["system_instruction"] = system_instruction
+        if generation_config is not None:
+            kwargs["generation_config"] = generation_config
+        model = genai.GenerativeModel(**kwargs)
+        self._models[key] = model
+        while len(self._models) > self.max_models:
+            self._models.popitem(last=False)
+        return model
+
+    def openai_clients(self, api_key: str, base_url: Optional[str] = None) -> Tuple[object, object]:
+        """Shared (OpenAI, AsyncOpenAI) pair on keep-alive connection pools."""
+        key = (api_key, base_url)
+        if key not in self._openai:
+            import httpx
+            from openai import OpenAI, AsyncOpenAI
+            limits = httpx.Limits(
+                max_connections=DEFAULT_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=DEFAULT_HTTP_KEEPALIVE
+            )
+            self._openai[key] = (
+                OpenAI(api_key=api_key, base_url=base_url, http_client=httpx.Client(limits=limits)),
+                AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=httpx.AsyncClient(limits=limits))
+            )
+        return self._openai[key]
+
+    def stats(self) -> Dict:
+        return {
+            "models": len(self._models),
+            "model_hits": self.hits,
+            "model_misses": self.misses,
+            "openai_clients": len(self._openai)
+        }
+
+_registry: Optional[ModelRegistry] = None
+
+def get_model_registry() -> ModelRegistry:
+    """Process-wide registry, so every session draws from the same clients and connections."""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
@@ -0,0 +1,113 @@
+"""
+@file llm_limits.py
+@description Per-provider concurrency caps and timeouts for async LLM calls.
+@module AIInterpreter
+"""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Dict, Optional
+
+DEFAULT_CONCURRENCY = {
+    "google": int(os.environ.get("CARGO_LLM_CONCURRENCY_GOOGLE", "64")),
+    "openai": int(os.environ.get("CARGO_LLM_CONCURRENCY_OPENAI", "64")),
+}
+DEFAULT_TIMEOUT = float(os.environ.get("CARGO_LLM_TIMEOUT", "30"))
+# Streams: max silence between two chunks, and max duration of the whole reply
+DEFAULT_STREAM_IDLE_TIMEOUT = float(os.environ.get("CARGO_LLM_STREAM_IDLE_TIMEOUT", "15"))
+DEFAULT_STREAM_TIMEOUT = float(os.environ.get("CARGO_LLM_STREAM_TIMEOUT", "60"))
+
+class ProviderLimiter:
+    """
+    Caps in-flight requests to one provider and bounds how long each may take.
+    Waiting for a slot counts against the timeout, so a saturated provider fails fast
+    instead of building an unbounded backlog.
+    """
+    def __init__(self, provider: str, max_concurrency: int, timeout: float = DEFAULT_TIMEOUT):
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.timeouts = 0
+        self.stream_timeouts = 0
+
+    async def run(self, awaitable: Awaitable, timeout: Optional[float] = None):
+        try:
+            return await asyncio.wait_for(self._guarded(awaitable), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    async def _guarded(self, awaitable: Awaitable):
+        started = False
+        try:
+            async with self._semaphore:
+                started = True
+                self.in_flight += 1
+                try:
+                    return await awaitable
+                finally:
+                    self.in_flight -= 1
+        finally:
+            # Cancelled while queued for a slot: discard the never-awaited coroutine
+            if not started and asyncio.iscoroutine(awaitable):
+                awaitable.close()
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None):
+        """
+        Holds one concurrency slot for the duration of a block (used by streaming calls,
+        which cannot be wrapped in a single awaitable). Only the wait for a slot is timed.
+        """
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def bounded(self, stream: AsyncIterator, idle_timeout: Optional[float] = None,
+                      total_timeout: Optional[float] = None) -> AsyncIterator:
+        """
+        Re-yields a provider stream, raising asyncio.TimeoutError if no chunk arrives for
+        `idle_timeout` seconds or the stream runs past `total_timeout`. Use it inside
+        `slot()`, so a stalled stream gives its slot back instead of holding it forever.
+        """
+        idle_timeout = idle_timeout or DEFAULT_STREAM_IDLE_TIMEOUT
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (total_timeout or DEFAULT_STREAM_TIMEOUT)
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                chunk = await asyncio.wait_for(stream.__anext__(), min(idle_timeout, remaining))
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                self.stream_timeouts += 1
+                raise
+            yield chunk
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "timeouts": self.timeouts,
+            "stream_timeouts": self.stream_timeouts
+        }
+
+_limiters: Dict[str, ProviderLimiter] = {}
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """Shared limiter per provider, so every session draws from the same pool."""
+    if provider not in _limiters:
+        _limiters[provider] = ProviderLimiter(provider, DEFAULT_CONCURRENCY.get(provider, 16))
+    return _limiters[provider]
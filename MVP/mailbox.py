@@ -0,0 +1,65 @@
+"""
+@file mailbox.py
+@description Per-session mailbox: state reads and writes from async commands run as ordered messages between ticks.
+@module GameEngine
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+class SessionMailbox:
+    """
+    Serializes every access to one habitat's state from async command handlers.
+
+    A command handler never touches the GameState across an `await`: it posts a small
+    synchronous message (`await mailbox.call(fn, ...)`), and all its LLM work runs
+    concurrently in between. Messages run in arrival order, as one event-loop callback
+    scheduled with `call_soon`. The physics step is itself a single synchronous
+    callback, so a message always lands between two ticks, never inside one.
+    Each session has its own mailbox, so there is no global lock: sessions never wait
+    on each other, only on their own earlier messages.
+    """
+    def __init__(self):
+        self._queue: Deque[Tuple[Callable, tuple, asyncio.Future]] = deque()
+        self._scheduled = False
+
+        # Metrics
+        self.processed = 0
+        self.skipped = 0   # Callers gave up (cancelled) before their message ran
+        self.max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def call(self, fn: Callable, *args) -> asyncio.Future:
+        """Queues `fn(*args)`. The returned future resolves with its result (or exception)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((fn, args, future))
+        self.max_depth = max(self.max_depth, len(self._queue))
+        if not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._drain)
+        return future
+
+    def _drain(self):
+        self._scheduled = False
+        while self._queue:
+            fn, args, future = self._queue.popleft()
+            if future.cancelled():
+                self.skipped += 1
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            self.processed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._queue),
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "max_depth": self.max_depth
+        }
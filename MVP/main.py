@@ -4,43 +4,70 @@
 @module GameEngine
 """
 
+import os
 import time
+from typing import AsyncIterator, Optional, Tuple
 from MVP.state_schema import GameState
 from MVP.physics_engine import PhysicsSimulator
 from MVP.scenario_manager import ScenarioManager
-from MVP.survivor_jack import SurvivorJack
-from MVP.ai_middleware import CommandInterpreter
-from MVP.prompts import JACK_SYSTEM_PROMPT, get_context_prompt
+from MVP.survivor_jack import StreamInterrupted, SurvivorJack, strip_thought
+from MVP.conversation_memory import ConversationMemory
+from MVP.response_cache import ResponseCache, get_response_cache
+from MVP.snapshots import Snapshot, capture, restore_state
+from MVP.mailbox import SessionMailbox
+from MVP.ai_middleware import CommandInterpreter, INTENT_SCHEMA
+from MVP.prompts import (
+    JACK_SYSTEM_PROMPT, COMBINED_OUTPUT_FORMAT, build_situation_block, build_turn_prompt
+)
+
+# One structured LLM call (intent + reply) per command instead of two
+COMBINED_LLM_CALL = os.environ.get("CARGO_COMBINED_LLM_CALL", "0") == "1"
+
+# Built once: a stable system prefix is what lets providers reuse their prompt cache
+COMBINED_SYSTEM_PROMPT = JACK_SYSTEM_PROMPT + COMBINED_OUTPUT_FORMAT.format(intent_schema=INTENT_SCHEMA.strip())
 
 class GameEngine:
-    def __init__(self):
+    def __init__(self, combined_llm_call: bool = COMBINED_LLM_CALL,
+                 response_cache: Optional[ResponseCache] = None):
         # 1. Initialize State (Single Source of Truth)
         self.state = GameState()
         
-        # 2. Initialize Physics
+        # 2. Initialize Physics (ticks on a compact mirror of the state, see PhysicsSimulator.sync)
         self.physics = PhysicsSimulator(self.state)
         
         # 3. Scenario Manager (Content Engine)
         self.scenario_manager = ScenarioManager(self.state)
         self.scenario_manager.load_scenario("co2_crisis")
+        self.physics.reload()
+
+        # 4. Conversation Memory (bounded: recent turns verbatim, older ones summarized)
+        self.memory = ConversationMemory()
 
-        # 4. Initialize AI Agents
-        self.jack = SurvivorJack(use_mock=False)
+        # 5. Initialize AI Agents
+        self.jack = SurvivorJack(use_mock=False, memory=self.memory)
         self.middleware = CommandInterpreter(
             provider=self.jack.provider,
             client=self.jack.client,
-            model=self.jack.model
+            model=self.jack.model,
+            async_client=self.jack.async_client
         )
         
-        # 4. Message History
-        self.history = []
+        self.combined_llm_call = combined_llm_call
 
-    def tick(self, delta_time: float = 1.0) -> dict:
+        # 6. Shared pools of replies to scripted results (skips the LLM for repeated outcomes)
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+
+        # 7. Ordered state access for async commands (see MVP/mailbox.py)
+        self.mailbox = SessionMailbox()
+
+    def tick(self, delta_time: float = 1.0, include_sensory: bool = True) -> dict:
         """
         Advances the game simulation by one tick (real-time).
-        Returns telemetry data.
+        Returns telemetry data. With include_sensory=False the tick does no text work;
+        callers fetch it later via `sensory()` only if someone needs it.
         """
-        sensory_feedback = self.physics.simulation_step(delta_time)
+        self.physics.advance(delta_time)
+        sensory_feedback = self.physics.sensory_text() if include_sensory else None
         
         # Check for Critical Events (e.g. Death)
         game_over = False
@@ -54,55 +81,52 @@ class GameEngine:
             "game_over": game_over
         }
 
+    def fast_forward(self, seconds: float, delta_time: float = 1.0, stop_on=None):
+        """
+        Advances the simulation by `seconds` in one call, as if ticked every `delta_time`
+        (see PhysicsSimulator.fast_forward). Used to catch up suspended sessions; events
+        crossed on the way are logged.
+        """
+        result = self.physics.fast_forward(seconds, delta_time=delta_time, stop_on=stop_on)
+        for event in result.events:
+            print(f"[ENGINE] t={event.game_time:.0f}s {event.name} {'ON' if event.active else 'OFF'}")
+        return result
+
+    def snapshot(self, previous: Optional[Snapshot] = None) -> Snapshot:
+        """
+        Binary snapshot of the habitat (GameState + puzzle progress). Sections unchanged
+        since `previous` share its blobs (see MVP/snapshots.py). Conversation memory is not included.
+        """
+        return capture(self.physics.sync(), self.physics.hot.previous_temperature,
+                       self.scenario_manager.progress(), previous)
+
+    def restore(self, snapshot: Snapshot):
+        """Replaces the habitat with a snapshot. Raises SnapshotError if it cannot be decoded."""
+        state, previous_temperature, progress = restore_state(snapshot)
+        self.state = self.physics.state = self.scenario_manager.state = state
+        self.scenario_manager.restore_progress(progress)
+        self.physics.reload(previous_temperature)
+
     def handle_command(self, user_input: str) -> dict:
         """
         Processes a user command (asynchronous to physics).
         """
         # 0. Context for AI
-        telemetry = self.get_telemetry()
-        context_snapshot = {
-            "environment": "Mars Habitat",
-            "telemetry": telemetry,
-            "jack_status": self.state.jack.status
-        }
+        telemetry, context_snapshot = self._read_context()
         
         # 1. Safety Check (Middleware)
         analysis = self.middleware.analyze_intent(user_input, context_snapshot)
         if not analysis["is_safe"]:
-            return {
-                "type": "INTERCEPT",
-                "jack_response": f"[SAFETY INTERLOCK]: {analysis['danger_reason']}",
-                "telemetry": telemetry
-            }
-
-        # 2. Physics-based Logic (Placeholder for Phase 3 Puzzles)
-        # Check if Scenario Manager handles this action (Scripted Event)
-        scripted_response = self.scenario_manager.process_action(analysis["intent"])
-        
-        # 3. Generate Jack's Response
-        # We inject the *current* sensory feedback into the prompt
-        sensory_feedback = self.physics.sensory_translator.translate(self.state)
-        
-        # Inject Telemetry into sensory feedback for immersive reporting
-        telemetry_report = (
-            f"\n[HUD DATA] "
-            f"CO2: {telemetry['co2']:.3f}% | "
-            f"TEMP: {telemetry['temp']:.1f}C | "
-            f"HR: {telemetry['heart_rate']}bpm"
-        )
-        
-        full_prompt = (
-            f"{JACK_SYSTEM_PROMPT}\n\n"
-            f"--- CURRENT SITUATION ---\n{sensory_feedback}\n{telemetry_report}\n"
-        )
+            return self._intercept(analysis, telemetry)
 
-        if scripted_response:
-             full_prompt += f"\n[ACTION RESULT]: {scripted_response}\n(Explain this result to the player in character)"
-        
-        full_prompt += f"\n--- USER COMMAND ---\n{user_input}\n"
-        
-        # Call LLM
-        response = self.jack.speak(JACK_SYSTEM_PROMPT, full_prompt)
+        # 2. Physics-based Logic: check if Scenario Manager handles this action (Scripted Event)
+        scripted_response, response, full_prompt = self._apply_intent(analysis["intent"], user_input, telemetry)
+
+        # 3. Generate Jack's Response (unless this scripted outcome already has a pool of replies)
+        generated = response is None
+        if generated:
+            response = strip_thought(self.jack.speak(JACK_SYSTEM_PROMPT, full_prompt))
+        telemetry = self._finish_turn(user_input, response, scripted_response, telemetry, generated)
         
         return {
             "type": "RESPONSE",
@@ -110,24 +134,251 @@ class GameEngine:
             "telemetry": telemetry
         }
 
+    async def ahandle_command(self, user_input: str) -> dict:
+        """
+        Async variant of `handle_command` used by the server.
+        Both LLM round-trips are awaited natively instead of occupying a worker thread.
+        State is only touched through the session mailbox, between ticks.
+        """
+        intercept, turn = await self._aplan_turn(user_input)
+        if intercept is not None:
+            return intercept
+
+        scripted_response, response, full_prompt, telemetry = turn
+        generated = response is None
+        if generated:
+            # Same text the streamed and pooled paths deliver: the thought section never leaves the engine
+            response = strip_thought(await self.jack.aspeak(JACK_SYSTEM_PROMPT, full_prompt))
+        telemetry = await self.mailbox.call(
+            self._finish_turn, user_input, response, scripted_response, telemetry, generated)
+
+        return {
+            "type": "RESPONSE",
+            "jack_response": response,
+            "telemetry": telemetry
+        }
+
+    async def astream_command(self, user_input: str) -> AsyncIterator[dict]:
+        """
+        Streaming variant of `ahandle_command`.
+        Yields RESPONSE_CHUNK frames as Jack's reply is generated, then one RESPONSE_END
+        carrying the full text (or a single INTERCEPT frame if the command is unsafe).
+        A reply that is already written (pooled, or from the combined call) is sent as one chunk.
+        If the provider fails mid-reply, the error is appended for the player, but the broken
+        reply is neither pooled nor remembered.
+        """
+        intercept, turn = await self._aplan_turn(user_input)
+        if intercept is not None:
+            yield intercept
+            return
+
+        scripted_response, response, full_prompt, telemetry = turn
+        generated = response is None
+        if not generated:
+            yield {"type": "RESPONSE_CHUNK", "delta": response}
+        else:
+            chunks = []
+            try:
+                async for text in self.jack.aspeak_stream(JACK_SYSTEM_PROMPT, full_prompt):
+                    chunks.append(text)
+                    yield {"type": "RESPONSE_CHUNK", "delta": text}
+            except StreamInterrupted as e:
+                partial = "".join(chunks)
+                error = str(e) if not partial or partial[-1].isspace() else " " + str(e)
+                yield {"type": "RESPONSE_CHUNK", "delta": error}
+                yield {
+                    "type": "RESPONSE_END",
+                    "jack_response": (partial + error).strip(),
+                    "telemetry": await self.mailbox.call(self.get_telemetry)
+                }
+                return
+            response = "".join(chunks).strip()
+
+        telemetry = await self.mailbox.call(
+            self._finish_turn, user_input, response, scripted_response, telemetry, generated)
+        yield {
+            "type": "RESPONSE_END",
+            "jack_response": response,
+            "telemetry": telemetry
+        }
+
+    async def _aplan_turn(self, user_input: str) -> Tuple[Optional[dict], Optional[tuple]]:
+        """
+        Safety checks and the scripted action, shared by the async command paths.
+        Returns (INTERCEPT frame, None) for an unsafe command, otherwise
+        (None, (scripted result, reply, prompt, telemetry)). `reply` is None when Jack's
+        reply still has to be generated from `prompt`.
+        """
+        if self.combined_llm_call and not self.jack.use_mock:
+            planned = await self._aplan_combined(user_input)
+            if planned is not None:
+                return planned
+            print("[ENGINE] Combined call failed, falling back to two-call path")
+
+        telemetry, context_snapshot = await self.mailbox.call(self._read_context)
+
+        analysis = await self.middleware.aanalyze_intent(user_input, context_snapshot)
+        if not analysis["is_safe"]:
+            return self._intercept(analysis, await self.mailbox.call(self.get_telemetry)), None
+
+        scripted_response, cached, full_prompt = await self.mailbox.call(
+            self._apply_intent, analysis["intent"], user_input, telemetry)
+        return None, (scripted_response, cached, full_prompt, telemetry)
+
+    async def _aplan_combined(self, user_input: str) -> Optional[Tuple[Optional[dict], Optional[tuple]]]:
+        """
+        Single round-trip variant of `_aplan_turn`: one structured call returns both the
+        intent and Jack's reply. The intent still goes through the keyword and context safety
+        checks, and drives the ScenarioManager exactly like a parsed intent would.
+        The model writes its reply before the action runs, so that reply is only used when
+        the action had no scripted result. Otherwise Jack's reply comes from the pool or a
+        follow-up call that sees the result, like in the two-call path.
+        Returns None when the structured output is unusable, so the caller can fall back.
+        """
+        # Level 1 first: never pay for an LLM call on a blocked command
+        blocked = self.middleware.screen_keywords(user_input)
+        if blocked:
+            telemetry, _ = await self.mailbox.call(self._read_context)
+            return self._intercept(blocked, telemetry), None
+
+        telemetry, context_snapshot, user_prompt = await self.mailbox.call(self._read_combined_context, user_input)
+
+        result = await self.jack.aspeak_json(COMBINED_SYSTEM_PROMPT, user_prompt)
+        if not result:
+            return None
+        intent, reply = result.get("intent"), result.get("response")
+        if not isinstance(intent, dict) or not isinstance(reply, str):
+            return None
+        reply = strip_thought(reply)
+        if not reply:
+            return None
+
+        analysis = self.middleware.check_intent(user_input, intent, context_snapshot)
+        if not analysis["is_safe"]:
+            return self._intercept(analysis, await self.mailbox.call(self.get_telemetry)), None
+
+        scripted_response, cached, full_prompt = await self.mailbox.call(
+            self._apply_intent, intent, user_input, telemetry)
+        if scripted_response:
+            reply = cached
+            if reply is None:
+                print("[ENGINE] Scripted result changed the state; regenerating Jack's reply")
+        return None, (scripted_response, reply, full_prompt, telemetry)
+
+    # --- Mailbox messages (run between ticks; never await inside) ---
+
+    def _read_context(self) -> Tuple[dict, dict]:
+        telemetry = self.get_telemetry()
+        return telemetry, self._context_snapshot(telemetry)
+
+    def _read_combined_context(self, user_input: str) -> Tuple[dict, dict, str]:
+        telemetry, context_snapshot = self._read_context()
+        user_prompt = build_turn_prompt(
+            self._situation_block(telemetry),
+            user_input,
+            world_facts=self.scenario_manager.describe_world(),
+            memory_summary=self.memory.transcript()
+        )
+        return telemetry, context_snapshot, user_prompt
+
+    def _apply_intent(self, intent: dict, user_input: str,
+                      telemetry: dict) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """
+        Runs the scripted action, then looks for a pooled reply.
+        Returns (scripted result, cached reply, prompt); the prompt is None on a cache hit.
+        """
+        scripted_response = self._process_action(intent)
+        cached = self._cached_reply(scripted_response, telemetry)
+        if cached is not None:
+            return scripted_response, cached, None
+        return scripted_response, None, self._build_prompt(scripted_response, user_input, telemetry)
+
+    def _finish_turn(self, user_input: str, response: str, scripted_response: Optional[str],
+                     telemetry: dict, generated: bool = False) -> dict:
+        """
+        Pools a freshly generated reply and stores the exchange in memory.
+        Returns the current telemetry: the reply frame must show the state after the action
+        (e.g. the new inventory), not the snapshot the prompt was built from.
+        """
+        if generated:
+            self._store_reply(scripted_response, telemetry, response)
+        self._remember(user_input, response, scripted_response)
+        return self.get_telemetry()
+
+    def _process_action(self, intent: dict) -> Optional[str]:
+        """Runs the scenario on an up-to-date GameState, then hands its edits back to the physics."""
+        self.physics.sync()
+        scripted_response = self.scenario_manager.process_action(intent)
+        self.physics.reload()
+        return scripted_response
+
+    def _context_snapshot(self, telemetry: dict) -> dict:
+        return {
+            "environment": "Mars Habitat",
+            "telemetry": telemetry,
+            "jack_status": self.state.jack.status
+        }
+
+    def _intercept(self, analysis: dict, telemetry: dict) -> dict:
+        return {
+            "type": "INTERCEPT",
+            "jack_response": f"[SAFETY INTERLOCK]: {analysis['danger_reason']}",
+            "telemetry": telemetry
+        }
+
+    def _build_prompt(self, scripted_response: Optional[str], user_input: str, telemetry: dict) -> str:
+        """
+        Dynamic part of the prompt only. JACK_SYSTEM_PROMPT is passed separately as the
+        system prompt, exactly once, so it stays a stable cacheable prefix.
+        """
+        return build_turn_prompt(
+            self._situation_block(telemetry),
+            user_input,
+            scripted_response,
+            memory_summary=self.memory.summary()
+        )
+
+    def _cached_reply(self, scripted_response: Optional[str], telemetry: dict) -> Optional[str]:
+        if not scripted_response:
+            return None
+        return self.response_cache.get(scripted_response, telemetry)
+
+    def _store_reply(self, scripted_response: Optional[str], telemetry: dict, response: str):
+        if scripted_response:
+            self.response_cache.put(scripted_response, telemetry, strip_thought(response))
+
+    def _remember(self, user_input: str, response: str, scripted_response: Optional[str] = None):
+        """Stores one exchange in the session memory (errors and the thought section are left out)."""
+        reply = strip_thought(response)
+        if reply and not reply.startswith(("[COMM ERROR]", "[API ERROR]")):
+            self.memory.add(user_input, reply, scripted_response)
+
+    def _situation_block(self, telemetry: dict) -> str:
+        # We inject the *current* sensory feedback into the prompt
+        descriptions = self.physics.sensory_translator.describe(self.physics.sync())
+        return build_situation_block(descriptions, telemetry)
+
+    def sensory(self) -> str:
+        """Sensory text for the current tick (memoized, see PhysicsSimulator.sensory_text)."""
+        return self.physics.sensory_text()
+
     def get_telemetry(self) -> dict:
         """Helper to extract clean telemetry for Frontend"""
-        env = self.state.environment
-        jack = self.state.jack
-        power = self.state.power_system
+        # Physics values come straight from the hot state, so no sync is needed per tick
+        hot = self.physics.hot
         
         # Helper to get inventory names
-        inventory_names = [item.name for item in jack.inventory]
+        inventory_names = [item.name for item in self.state.jack.inventory]
 
         return {
-            "co2": round(env.co2_level, 3),
-            "temp": round(env.temperature, 1),
-            "pressure": round(env.pressure, 1),
-            "o2": round(env.oxygen_level, 1),
-            "heart_rate": jack.vitals.heart_rate,
-            "stress": round(jack.stress_level, 1),
-            "battery": round(power.backup_battery.charge_percent, 1),
-            "power_draw": round(power.total_load, 1),
+            "co2": round(hot.co2, 3),
+            "temp": round(hot.temperature, 1),
+            "pressure": round(hot.pressure, 1),
+            "o2": round(hot.oxygen, 1),
+            "heart_rate": hot.heart_rate,
+            "stress": round(hot.stress, 1),
+            "battery": round(self.state.power_system.backup_battery.charge_percent, 1),
+            "power_draw": round(hot.total_load, 1),
             "inventory": inventory_names
         }
 
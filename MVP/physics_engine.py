@@ -7,8 +7,20 @@
 import math
 import random
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional
 from MVP.state_schema import GameState
+from MVP.hot_state import HotState
+
+# Habitat constants shared by the per-tick updates and the fast-forward closed forms
+BASE_O2_CONSUMPTION = 0.0008    # % per sec for a 500m3 volume
+RESPIRATORY_QUOTIENT = 0.8      # CO2 produced per unit of O2 consumed
+JACK_HEAT_WATTS = 100.0
+OUTSIDE_TEMP = -60.0            # Mars surface (C)
+INSULATION_FACTOR = 50.0        # W per degree of difference to outside
+AIR_MASS = 600.0                # kg, approx 500m3 of air
+SPECIFIC_HEAT = 1005.0          # J/kgK
+LEAK_RATE = 0.1                 # kPa per sec per open breach
+BASE_LOAD = 100.0               # Watts drawn with all equipment off
 
 def lerp(start, end, t):
     return start + (end - start) * t
@@ -19,8 +31,48 @@ def clamp(val, min_val, max_val):
 class SensoryTranslator:
     """
     Translates numerical state into human-readable sensory descriptions.
+    Descriptions depend only on a few bucketed inputs (see `bucket`), so they are
+    memoized and rebuilt only when one of those buckets changes.
     """
+    def __init__(self):
+        self._bucket: Optional[tuple] = None
+        self._descriptions: List[str] = []
+        self.hits = 0
+        self.rebuilds = 0
+
     def translate(self, state: GameState) -> str:
+        return self.compile_prompt(self.describe(state), state)
+
+    @staticmethod
+    def bucket(state: GameState) -> tuple:
+        """Every input the descriptions branch on, coarsened to the thresholds used below."""
+        env = state.environment
+        power = state.power_system
+        temp = env.temperature
+        return (
+            4 if temp > 50 else 3 if temp > 35 else 0 if temp < -20 else 1 if temp < 5 else 2,
+            env.pressure * (env.oxygen_level / 100.0) < 12,
+            env.pressure < 70,
+            2 if env.co2_level > 3.0 else 1 if env.co2_level > 1.0 else 0,
+            state.jack.stress_level > 80,
+            state.jack.fatigue > 80,
+            power.main_bus.online,
+            power.backup_battery.charge_percent < 20,
+            state.life_support.air_circulation.status,
+        )
+
+    def describe(self, state: GameState) -> List[str]:
+        """Sensory descriptions only, without the [HUD DATA] line. Memoized on `bucket(state)`."""
+        bucket = self.bucket(state)
+        if bucket == self._bucket:
+            self.hits += 1
+            return list(self._descriptions)
+        self.rebuilds += 1
+        self._bucket = bucket
+        self._descriptions = self._build_descriptions(state)
+        return list(self._descriptions)
+
+    def _build_descriptions(self, state: GameState) -> List[str]:
         descriptions = []
         
         # Environment
@@ -35,7 +87,7 @@ class SensoryTranslator:
         sys_desc = self.translate_system_status(state)
         if sys_desc: descriptions.append(sys_desc)
         
-        return self.compile_prompt(descriptions, state)
+        return descriptions
 
     def translate_environment(self, state: GameState) -> Optional[str]:
         env = state.environment
@@ -97,22 +149,87 @@ class SensoryTranslator:
         )
         return base + telemetry
 
+class PhysicsEvent(NamedTuple):
+    name: str        # Threshold that was crossed (see PhysicsSimulator.threshold_flags)
+    active: bool     # True when the condition started, False when it cleared
+    tick: int
+    game_time: float
+
+class FastForwardResult(NamedTuple):
+    elapsed: float   # Simulated seconds actually advanced
+    steps: int       # Equivalent number of simulation_step calls
+    segments: int    # Closed-form segments used (each ends at a threshold crossing)
+    events: List[PhysicsEvent]
+    stopped: bool    # True if a `stop_on` event ended the fast-forward early
+
+class _Segment(NamedTuple):
+    """Per-step rates implied by the state at the start of a fast-forward segment."""
+    delta_time: float
+    powered: bool
+    o2_rate: float
+    co2_rate: float
+    heat_input: float
+    load: float
+    drain_wh: float      # Battery drain per step (0 when solar covers the load)
+    stress_rate: float
+    target_hr: int
+
 class PhysicsSimulator:
     """
     Project: CARGO Physics Engine V1.0
     Simulation Step: 1 second per tick.
+
+    The tick runs on `self.hot` (a slotted HotState mirror), not on the Pydantic GameState.
+    The GameState lags behind until `sync()`; anything that edits it directly
+    (scenarios, commands) must call `reload()` afterwards. See GameEngine for the boundaries.
     """
     
     def __init__(self, initial_state: GameState):
         self.state = initial_state
+        self.hot = HotState.from_state(initial_state)
         self.sensory_translator = SensoryTranslator()
-        self.previous_temperature = initial_state.environment.temperature
+        self._dirty = False # hot is ahead of state
+        self._sensory_tick: Optional[int] = None
+        self._sensory_text = ""
+
+    # --- Boundary Sync ---
+
+    def sync(self) -> GameState:
+        """Writes the hot state back into the GameState (no-op if nothing ticked since). Returns it."""
+        if self._dirty:
+            self.hot.store(self.state)
+            self._dirty = False
+        return self.state
+
+    def reload(self, previous_temperature: Optional[float] = None):
+        """
+        Re-reads the GameState after outside edits. Call `sync()` before making them.
+        `previous_temperature` is kept unless given (e.g. when restoring a snapshot).
+        """
+        if previous_temperature is None:
+            previous_temperature = self.hot.previous_temperature
+        self.hot.load(self.state, previous_temperature)
+        self._dirty = False
+        self._sensory_tick = None
 
     def simulation_step(self, delta_time: float = 1.0) -> str:
         """
         Advances the simulation by delta_time seconds.
         Returns sensory feedback string.
         """
+        self.advance(delta_time)
+        return self.sensory_text()
+
+    def sensory_text(self) -> str:
+        """Sensory feedback for the current tick, built at most once per tick and only on demand."""
+        tick = self.hot.simulation_tick
+        if tick != self._sensory_tick:
+            self._sensory_text = self.sensory_translator.translate(self.sync())
+            self._sensory_tick = tick
+        return self._sensory_text
+
+    def advance(self, delta_time: float):
+        """Advances the simulation by delta_time seconds without producing any text (hot path)."""
         # 1. Environment (Gas Laws)
         self.update_environment(delta_time)
         
@@ -123,118 +240,291 @@ class PhysicsSimulator:
         self.update_jack_physiology(delta_time)
         
         # Update metadata
-        self.state.metadata.simulation_tick += 1
-        self.state.metadata.game_time_seconds += delta_time
-        
-        return self.sensory_translator.translate(self.state)
+        hot = self.hot
+        hot.simulation_tick += 1
+        hot.game_time += delta_time
+        self._dirty = True
 
     def update_environment(self, delta_time: float):
-        env = self.state.environment
-        ls = self.state.life_support
+        hot = self.hot
         
         # --- O2 & CO2 ---
-        # Base consumption: ~0.0008% per sec for 500m3 volume
-        base_o2_consumption = 0.0008 
-        o2_consumption = base_o2_consumption # Could add activity multipliers
+        o2_consumption = BASE_O2_CONSUMPTION # Could add activity multipliers
         
-        co2_production = o2_consumption * 0.8 # RQ = 0.8
+        co2_production = o2_consumption * RESPIRATORY_QUOTIENT
         
         # Scrubber
         co2_scrubbing = 0.0
-        if ls.co2_scrubber.status == "on" and self.has_power():
-            co2_scrubbing = ls.co2_scrubber.scrub_rate / 60.0 # Convert min to sec
+        if hot.scrubber_on and hot.bus_online:
+            co2_scrubbing = hot.scrub_rate / 60.0 # Convert min to sec
             
         # O2 Gen
         o2_replenishment = 0.0
-        if ls.o2_generator.status == "on" and self.has_power():
-            o2_replenishment = ls.o2_generator.output_rate / 60.0
+        if hot.o2_gen_on and hot.bus_online:
+            o2_replenishment = hot.o2_output_rate / 60.0
             
-        env.oxygen_level = clamp(env.oxygen_level + (o2_replenishment - o2_consumption) * delta_time, 0.0, 100.0)
-        env.co2_level = clamp(env.co2_level + (co2_production - co2_scrubbing) * delta_time, 0.0, 100.0)
+        hot.oxygen = clamp(hot.oxygen + (o2_replenishment - o2_consumption) * delta_time, 0.0, 100.0)
+        hot.co2 = clamp(hot.co2 + (co2_production - co2_scrubbing) * delta_time, 0.0, 100.0)
         
         # --- Temperature (Newton's Law of Cooling) ---
         # Heat Sources
-        jack_heat = 100.0 # Watts
-        equip_heat = self.state.power_system.total_load * 0.1
-        heater_heat = ls.heater.output_watts if (ls.heater.status and self.has_power()) else 0.0
+        jack_heat = JACK_HEAT_WATTS
+        equip_heat = hot.total_load * 0.1
+        heater_heat = hot.heater_watts if (hot.heater_on and hot.bus_online) else 0.0
         
         total_heat_input = jack_heat + equip_heat + heater_heat
         
         # Heat Loss (Simplified Radiation + Conduction)
         # Assuming outside is very cold (-270C space / -60C Mars)
-        temp_diff = env.temperature - (-60.0) 
-        heat_loss = temp_diff * 50.0 # Arbitrary insulation factor
+        temp_diff = hot.temperature - OUTSIDE_TEMP
+        heat_loss = temp_diff * INSULATION_FACTOR
         
         net_heat = total_heat_input - heat_loss
         
-        # Heat Capacity of Air (approx 500m3 ~ 600kg)
-        air_mass = 600.0
-        specific_heat = 1005.0 # J/kgK
-        
-        temp_change = (net_heat * delta_time) / (air_mass * specific_heat)
-        env.temperature += temp_change
+        # Heat Capacity of Air
+        temp_change = (net_heat * delta_time) / (AIR_MASS * SPECIFIC_HEAT)
+        hot.temperature += temp_change
         
         # --- Pressure (Gas Law P ~ T) ---
         # If temp changes, pressure changes (PV=nRT -> P ~ T)
-        if env.temperature != self.previous_temperature:
-            temp_ratio = (env.temperature + 273.15) / (self.previous_temperature + 273.15)
-            env.pressure *= temp_ratio
-            self.previous_temperature = env.temperature
+        if hot.temperature != hot.previous_temperature:
+            temp_ratio = (hot.temperature + 273.15) / (hot.previous_temperature + 273.15)
+            hot.pressure *= temp_ratio
+            hot.previous_temperature = hot.temperature
             
         # Leaks
-        for breach in env.breaches:
-            if not breach.is_sealed:
-                # Simplified leak rate
-                leak_rate = 0.1 * delta_time # kPa per sec per breach (simplified)
-                env.pressure = max(0.0, env.pressure - leak_rate)
+        for _ in range(hot.open_breaches):
+            # Simplified leak rate
+            leak_rate = LEAK_RATE * delta_time
+            hot.pressure = max(0.0, hot.pressure - leak_rate)
 
     def update_power_system(self, delta_time: float):
-        power = self.state.power_system
-        ls = self.state.life_support
+        hot = self.hot
         
         # Calculate Load
-        load = 100.0 # Base load
-        if ls.co2_scrubber.status == "on": load += ls.co2_scrubber.power_draw
-        if ls.o2_generator.status == "on": load += ls.o2_generator.power_draw
-        if ls.heater.status: load += ls.heater.power_draw
-        if ls.air_circulation.status: load += ls.air_circulation.power_draw
+        load = self.calculate_load()
         
-        power.total_load = load
+        hot.total_load = load
         
         # Solar / Battery Logic
-        solar_output = power.solar_panels.output_watts if power.solar_panels.online else 0.0
+        solar_output = hot.solar_watts if hot.solar_online else 0.0
         # Simplified: if solar > load, charge battery; else drain battery
         if solar_output >= load:
             excess = solar_output - load
             # Charge logic here (omitted for brevity)
-            power.main_bus.online = True
+            hot.bus_online = True
         else:
             deficit = load - solar_output
             # Drain battery
             drain_wh = (deficit * delta_time) / 3600.0
-            power.backup_battery.capacity_wh -= drain_wh
-            if power.backup_battery.capacity_wh <= 0:
-                power.backup_battery.capacity_wh = 0
-                power.main_bus.online = False # Blackout
+            hot.battery_wh -= drain_wh
+            if hot.battery_wh <= 0:
+                hot.battery_wh = 0
+                hot.bus_online = False # Blackout
 
     def update_jack_physiology(self, delta_time: float):
-        jack = self.state.jack
-        env = self.state.environment
+        hot = self.hot
         
         # Heart Rate
         target_hr = 75
-        if jack.stress_level > 50: target_hr += 20
-        if env.co2_level > 1.0: target_hr += 30
-        if env.oxygen_level < 18.0: target_hr += 20
+        if hot.stress > 50: target_hr += 20
+        if hot.co2 > 1.0: target_hr += 30
+        if hot.oxygen < 18.0: target_hr += 20
         
-        jack.vitals.heart_rate = int(lerp(jack.vitals.heart_rate, target_hr, 0.1 * delta_time))
+        hot.heart_rate = int(lerp(hot.heart_rate, target_hr, 0.1 * delta_time))
         
         # Stress
         stress_inc = 0.0
-        if env.co2_level > 1.0: stress_inc += 1.0
-        if env.temperature > 35 or env.temperature < 5: stress_inc += 0.5
+        if hot.co2 > 1.0: stress_inc += 1.0
+        if hot.temperature > 35 or hot.temperature < 5: stress_inc += 0.5
         
-        jack.stress_level = clamp(jack.stress_level + stress_inc * delta_time, 0.0, 100.0)
+        hot.stress = clamp(hot.stress + stress_inc * delta_time, 0.0, 100.0)
+
+    def calculate_load(self) -> float:
+        hot = self.hot
+        load = BASE_LOAD
+        if hot.scrubber_on: load += hot.scrubber_draw
+        if hot.o2_gen_on: load += hot.o2_gen_draw
+        if hot.heater_on: load += hot.heater_draw
+        if hot.fan_on: load += hot.fan_draw
+        return load
 
     def has_power(self) -> bool:
-        return self.state.power_system.main_bus.online
+        return self.hot.bus_online
+
+    # --- Fast-forward ---
+
+    @staticmethod
+    def threshold_flags(hot: HotState) -> Dict[str, bool]:
+        """Conditions that change the physics (or Jack) when crossed. Fast-forward never steps over one."""
+        return {
+            "co2_high": hot.co2 > 1.0,
+            "o2_low": hot.oxygen < 18.0,
+            "stress_high": hot.stress > 50,
+            "overheat": hot.temperature > 35,
+            "cold": hot.temperature < 5,
+            "blackout": not hot.bus_online,
+        }
+
+    def fast_forward(self, duration: float, delta_time: float = 1.0,
+                     stop_on: Optional[Iterable[str]] = None) -> FastForwardResult:
+        """
+        Advances `duration` seconds in one call, equivalent to calling `simulation_step(delta_time)`
+        repeatedly (to float rounding). Between threshold crossings every quantity follows a
+        closed form of the stepped model: O2/CO2/stress/battery are linear, temperature is
+        the geometric Newton-cooling sequence and pressure follows the gas law. Segment ends
+        are found by binary search, so each crossing lands on the exact step it happens in.
+
+        `stop_on` names threshold flags (see `threshold_flags`), e.g. {"co2_high", "blackout"}:
+        the fast-forward stops right after the step where one of them changes.
+        """
+        stop_on = set(stop_on or ())
+        remaining = int(duration / delta_time + 1e-9)
+        tail = duration - remaining * delta_time
+        start_time = self.hot.game_time
+        events: List[PhysicsEvent] = []
+        steps = segments = 0
+
+        while remaining > 0:
+            before = self.threshold_flags(self.hot)
+            count = self._advance_segment(delta_time, remaining)
+            remaining -= count
+            steps += count
+            segments += 1
+            if self._record_crossings(before, events) & stop_on:
+                return FastForwardResult(self.hot.game_time - start_time, steps, segments, events, True)
+
+        if tail > 1e-9:
+            before = self.threshold_flags(self.hot)
+            self.advance(tail)
+            steps += 1
+            self._record_crossings(before, events)
+
+        stopped = bool(events) and events[-1].name in stop_on
+        return FastForwardResult(self.hot.game_time - start_time, steps, segments, events, stopped)
+
+    def _record_crossings(self, before: Dict[str, bool], events: List[PhysicsEvent]) -> set:
+        after = self.threshold_flags(self.hot)
+        changed = {name for name, active in after.items() if active != before[name]}
+        hot = self.hot
+        for name in sorted(changed):
+            events.append(PhysicsEvent(name, after[name], hot.simulation_tick, hot.game_time))
+        return changed
+
+    def _segment(self, delta_time: float) -> _Segment:
+        hot = self.hot
+        powered = self.has_power()
+
+        # Same rates as update_environment
+        o2_consumption = BASE_O2_CONSUMPTION
+        co2_scrubbing = hot.scrub_rate / 60.0 if hot.scrubber_on and powered else 0.0
+        o2_replenishment = hot.o2_output_rate / 60.0 if hot.o2_gen_on and powered else 0.0
+        heater_heat = hot.heater_watts if (hot.heater_on and powered) else 0.0
+        heat_input = JACK_HEAT_WATTS + hot.total_load * 0.1 + heater_heat
+
+        load = self.calculate_load()
+        solar_output = hot.solar_watts if hot.solar_online else 0.0
+        drain_wh = (load - solar_output) * delta_time / 3600.0 if solar_output < load else 0.0
+
+        segment = _Segment(delta_time, powered, o2_replenishment - o2_consumption,
+                           o2_consumption * RESPIRATORY_QUOTIENT - co2_scrubbing, heat_input, load, drain_wh, 0.0, 0)
+
+        # Physiology reads the post-environment values of the same step
+        o2, co2, temp = self._project_environment(segment, 1)
+        stress_rate = 0.0
+        if co2 > 1.0: stress_rate += 1.0
+        if temp > 35 or temp < 5: stress_rate += 0.5
+        target_hr = 75
+        if hot.stress > 50: target_hr += 20
+        if co2 > 1.0: target_hr += 30
+        if o2 < 18.0: target_hr += 20
+        return segment._replace(stress_rate=stress_rate, target_hr=target_hr)
+
+    def _project_environment(self, seg: _Segment, steps: int):
+        """(O2, CO2, temperature) after `steps` steps of `seg`."""
+        hot = self.hot
+        o2 = clamp(hot.oxygen + seg.o2_rate * seg.delta_time * steps, 0.0, 100.0)
+        co2 = clamp(hot.co2 + seg.co2_rate * seg.delta_time * steps, 0.0, 100.0)
+        # T[n+1] = T[n] + (Q - k (T[n] - T_out)) dt / C  =>  T[n] = T_eq + (T[0] - T_eq) r^n
+        decay = 1.0 - INSULATION_FACTOR * seg.delta_time / (AIR_MASS * SPECIFIC_HEAT)
+        t_eq = seg.heat_input / INSULATION_FACTOR + OUTSIDE_TEMP
+        temp = t_eq + (hot.temperature - t_eq) * decay ** steps
+        return o2, co2, temp
+
+    def _project_power(self, seg: _Segment, steps: int):
+        """(battery Wh, bus online, total load) after `steps` steps of `seg`."""
+        hot = self.hot
+        if steps == 0:
+            return hot.battery_wh, hot.bus_online, hot.total_load
+        if seg.drain_wh == 0.0:
+            return hot.battery_wh, True, seg.load
+        battery = hot.battery_wh - seg.drain_wh * steps
+        if battery <= 0:
+            return 0, False, seg.load
+        return battery, hot.bus_online, seg.load
+
+    def _regime(self, seg: _Segment, step: int) -> tuple:
+        """
+        Everything that selects the rates used by step number `step` (1-based), plus the
+        threshold flags after it, so a segment also ends on the step a flag changes.
+        """
+        _, bus, load = self._project_power(seg, step - 1)
+        _, bus_after, _ = self._project_power(seg, step)
+        stress = clamp(self.hot.stress + seg.stress_rate * seg.delta_time * (step - 1), 0.0, 100.0)
+        stress_after = clamp(stress + seg.stress_rate * seg.delta_time, 0.0, 100.0)
+        o2, co2, temp = self._project_environment(seg, step)
+        return (bus, load, stress > 50, co2 > 1.0, o2 < 18.0, temp > 35, temp < 5,
+                stress_after > 50, bus_after)
+
+    def _advance_segment(self, delta_time: float, max_steps: int) -> int:
+        """Applies the longest run of steps (<= max_steps) that share one regime. Returns its length."""
+        seg = self._segment(delta_time)
+        regime = self._regime(seg, 1)
+
+        # Every tracked quantity is monotonic within a segment, so the regime changes at most once.
+        # A flag that flips during step 1 ends the segment right there.
+        flags = self.threshold_flags(self.hot)
+        crosses_now = regime[3:7] != (flags["co2_high"], flags["o2_low"], flags["overheat"], flags["cold"]) \
+            or regime[7] != flags["stress_high"] or regime[8] == flags["blackout"]
+        lo, hi = 1, 1 if crosses_now else max_steps
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._regime(seg, mid) == regime:
+                lo = mid
+            else:
+                hi = mid - 1
+        steps = lo
+
+        hot = self.hot
+        o2, co2, temp = self._project_environment(seg, steps)
+
+        # Pressure: P/(T + 273.15) is conserved except for leaks, so only the leak term needs a sum
+        open_breaches = hot.open_breaches
+        if temp != hot.previous_temperature or open_breaches:
+            scaled = hot.pressure / (hot.previous_temperature + 273.15)
+            if open_breaches:
+                decay = 1.0 - INSULATION_FACTOR * delta_time / (AIR_MASS * SPECIFIC_HEAT)
+                t_eq = seg.heat_input / INSULATION_FACTOR + OUTSIDE_TEMP
+                leak = LEAK_RATE * delta_time * open_breaches
+                for n in range(1, steps + 1):
+                    scaled -= leak / (t_eq + (hot.temperature - t_eq) * decay ** n + 273.15)
+            hot.pressure = max(0.0, scaled * (temp + 273.15))
+            hot.previous_temperature = temp
+
+        hot.oxygen, hot.co2, hot.temperature = o2, co2, temp
+        hot.battery_wh, hot.bus_online, hot.total_load = self._project_power(seg, steps)
+        hot.stress = clamp(hot.stress + seg.stress_rate * delta_time * steps, 0.0, 100.0)
+
+        # Heart rate converges to a fixed point within a few dozen steps (int truncation)
+        heart_rate = hot.heart_rate
+        for _ in range(steps):
+            next_hr = int(lerp(heart_rate, seg.target_hr, 0.1 * delta_time))
+            if next_hr == heart_rate:
+                break
+            heart_rate = next_hr
+        hot.heart_rate = heart_rate
+
+        hot.simulation_tick += steps
+        hot.game_time += delta_time * steps
+        self._dirty = True
+        return steps
@@ -4,6 +4,8 @@
 @module AIPersona
 """
 
+from typing import Dict, List, Optional
+
 JACK_SYSTEM_PROMPT = """
 # Jack Morrison - System Prompt
 ## Project: CARGO - Mars Survival AI Persona
@@ -118,6 +120,62 @@ Since the player cannot see your vitals, you MUST casually mention your physical
 - If HR is high: "*pant* *pant* Heart's racing..."
 """
 
+COMBINED_OUTPUT_FORMAT = """
+## Output Format (OVERRIDES the Response Format above)
+
+Return ONLY a JSON object, no markdown:
+{{
+    "intent": {intent_schema},
+    "response": "Your in-character reply to the player (no [INTERNAL THOUGHT] section)"
+}}
+
+"intent" is a neutral, literal parse of the player's command.
+Use "examine" for looking/searching and "use_item" for repairs.
+"response" MUST stay consistent with the WORLD FACTS below: if the command searches a place,
+Jack finds exactly what is listed there. Never mention items in places he has not searched.
+"""
+
+def estimate_tokens(text: str) -> int:
+    """
+    Provider-agnostic token estimate (~4 characters per token for English prose).
+    Used for logging when the provider does not report usage (mock mode, streams).
+    """
+    return (len(text) + 3) // 4
+
+def build_situation_block(descriptions: List[str], telemetry: Dict) -> str:
+    """
+    The per-turn dynamic block: current sensory descriptions plus one HUD line.
+    Everything static (persona, format rules) lives in the system prompt instead, so the
+    system prompt is a byte-identical prefix on every call and can be cached by the provider.
+    """
+    hud = (
+        f"[HUD DATA] "
+        f"CO2: {telemetry['co2']:.3f}% | "
+        f"O2: {telemetry['o2']:.1f}% | "
+        f"TEMP: {telemetry['temp']:.1f}C | "
+        f"PRESS: {telemetry['pressure']:.1f}kPa | "
+        f"HR: {telemetry['heart_rate']}bpm | "
+        f"STRESS: {telemetry['stress']:.0f}%"
+    )
+    lines = list(descriptions) + [hud]
+    return "--- CURRENT SITUATION ---\n" + "\n".join(lines) + "\n"
+
+def build_turn_prompt(situation: str, user_input: str,
+                      scripted_response: Optional[str] = None,
+                      world_facts: Optional[str] = None,
+                      memory_summary: Optional[str] = None) -> str:
+    """Assembles the user message for one command. Never includes the persona."""
+    prompt = ""
+    if memory_summary:
+        prompt += f"--- EARLIER IN THIS CALL ---\n{memory_summary}\n\n"
+    prompt += situation
+    if world_facts:
+        prompt += f"\n--- WORLD FACTS ---\n{world_facts}\n"
+    if scripted_response:
+        prompt += f"\n[ACTION RESULT]: {scripted_response}\n(Explain this result to the player in character)"
+    prompt += f"\n--- USER COMMAND ---\n{user_input}\n"
+    return prompt
+
 def get_context_prompt(state_desc: str, user_input: str) -> str:
     """
     Generates the dynamic context block for the LLM.
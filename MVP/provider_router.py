@@ -0,0 +1,187 @@
+"""
+@file provider_router.py
+@description Hedged LLM requests across providers, with per-provider latency tracking and circuit breakers.
+@module AIInterpreter
+"""
+
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+HEDGE_PERCENTILE = float(os.environ.get("CARGO_HEDGE_PERCENTILE", "95"))  # 0 = never hedge (failover only)
+HEDGE_DEFAULT_DELAY = float(os.environ.get("CARGO_HEDGE_DELAY", "3.0"))   # seconds, until enough samples
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+BREAKER_FAILURES = int(os.environ.get("CARGO_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("CARGO_BREAKER_COOLDOWN", "30"))
+
+class ProviderUnavailable(Exception):
+    """Raised when the circuit breaker of every configured provider is open."""
+
+class ProviderHealth:
+    """
+    Recent latencies and a circuit breaker for one provider, shared by every session.
+
+    Breaker: `BREAKER_FAILURES` consecutive failures open it, and the provider is skipped.
+    After `BREAKER_COOLDOWN` seconds one trial request is let through (half-open).
+    If it succeeds the breaker closes; if it fails the breaker opens again.
+    """
+    def __init__(self, provider: str, failure_threshold: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+        # Metrics
+        self.successes = 0
+        self.failures = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def available(self) -> bool:
+        """True if a request may be sent now (claims the single trial slot when half-open)."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self, latency: Optional[float] = None):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial = False
+        if latency is not None:
+            self.latencies.append(latency)
+
+    def record_failure(self):
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self._trial or (self.opened_at is None and self.consecutive_failures >= self.failure_threshold):
+            if self.opened_at is None:
+                print(f"[ROUTER] Circuit open for {self.provider} ({self.consecutive_failures} failures)")
+                self.trips += 1
+            self.opened_at = time.monotonic()
+        self._trial = False
+
+    def release_trial(self):
+        """The trial request was cancelled before it finished: let the next request try instead."""
+        self._trial = False
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if len(self.latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+    def hedge_delay(self, pct: float = HEDGE_PERCENTILE) -> float:
+        """How long to wait on this provider before hedging to the next one."""
+        observed = self.percentile(pct)
+        return HEDGE_DEFAULT_DELAY if observed is None else observed
+
+    def stats(self) -> Dict:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "state": self.state,
+            "successes": self.successes,
+            "failures": self.failures,
+            "trips": self.trips,
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000)
+        }
+
+_health: Dict[str, ProviderHealth] = {}
+
+def get_provider_health(provider: str) -> ProviderHealth:
+    if provider not in _health:
+        _health[provider] = ProviderHealth(provider)
+    return _health[provider]
+
+# Routed calls across all sessions: hedges sent, and which attempt answered
+router_counts: Dict[str, int] = {"calls": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0, "unavailable": 0}
+
+def pick_provider(providers: List[str]) -> str:
+    """First provider (in preference order) whose breaker lets a request through."""
+    for provider in providers:
+        if get_provider_health(provider).available():
+            return provider
+    router_counts["unavailable"] += 1
+    raise ProviderUnavailable(f"All providers unavailable ({', '.join(providers)})")
+
+async def hedged(attempts: List[Tuple[str, Callable[[], Awaitable]]],
+                 percentile: float = HEDGE_PERCENTILE) -> Tuple[str, Any]:
+    """
+    Runs `attempts` ((provider, coroutine factory) in preference order) and returns
+    (provider, result) of the first one that succeeds.
+
+    The first available provider is called. If it is still running after its
+    `percentile` latency, the next provider gets a duplicate (a hedge); if it fails, the
+    next provider gets the request (failover). The losing request is cancelled. Only
+    the last failure is raised. Cancelling the caller cancels every attempt.
+    """
+    router_counts["calls"] += 1
+    candidates = list(attempts)
+    running: Dict[asyncio.Task, Tuple[str, float]] = {}
+    hedges = set()
+    last_error: Optional[BaseException] = None
+
+    def launch() -> Optional[asyncio.Task]:
+        # Checked only when needed, so a half-open trial slot is claimed only if it is used
+        while candidates:
+            provider, call = candidates.pop(0)
+            if get_provider_health(provider).available():
+                task = asyncio.ensure_future(call())
+                running[task] = (provider, time.monotonic())
+                return task
+        return None
+
+    first = launch()
+    if first is None:
+        router_counts["unavailable"] += 1
+        raise ProviderUnavailable(f"All providers unavailable ({', '.join(p for p, _ in attempts)})")
+    try:
+        while running:
+            timeout = None
+            if candidates and percentile > 0 and len(running) == 1 and first in running:
+                timeout = get_provider_health(running[first][0]).hedge_delay(percentile)
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                hedge = launch()
+                if hedge is not None:
+                    router_counts["hedges"] += 1
+                    hedges.add(hedge)
+                continue
+            for task in done:
+                provider, started = running.pop(task)
+                health = get_provider_health(provider)
+                if task.exception() is None:
+                    health.record_success(time.monotonic() - started)
+                    if task in hedges:
+                        router_counts["hedge_wins"] += 1
+                    return provider, task.result()
+                last_error = task.exception()
+                print(f"[ROUTER] {provider} failed: {last_error!r}")
+                health.record_failure()
+            if not running and launch() is not None:
+                router_counts["failovers"] += 1
+        raise last_error
+    finally:
+        for task, (provider, _) in running.items():
+            task.cancel()
+            get_provider_health(provider).release_trial()
+
+def router_stats() -> Dict:
+    return {**router_counts, "providers": {p: h.stats() for p, h in _health.items()}}
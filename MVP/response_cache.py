@@ -0,0 +1,158 @@
+"""
+@file response_cache.py
+@description Pools of in-character replies to scripted results, so repeated outcomes skip the LLM.
+@module PersonaManagement
+"""
+
+import os
+import time
+import random
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_RESPONSE_CACHE_SIZE = int(os.environ.get("CARGO_RESPONSE_CACHE_SIZE", "512"))
+DEFAULT_RESPONSE_POOL_SIZE = int(os.environ.get("CARGO_RESPONSE_POOL_SIZE", "4"))
+DEFAULT_RESPONSE_CACHE_TTL = float(os.environ.get("CARGO_RESPONSE_CACHE_TTL", "86400"))
+DEFAULT_RESPONSE_CACHE_POLICY = os.environ.get("CARGO_RESPONSE_CACHE_POLICY", "lru")
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+class _Pool:
+    __slots__ = ("variants", "duplicates", "expires_at", "uses", "last_served")
+
+    def __init__(self, expires_at: float):
+        self.variants: List[str] = []
+        self.duplicates = 0
+        self.expires_at = expires_at
+        self.uses = 0
+        self.last_served: Optional[int] = None
+
+class ResponseCache:
+    """
+    Caches Jack's rephrasing of a scripted result (e.g. "The shelf is empty.").
+
+    Keyed on (scripted result, stress bucket, telemetry bucket): the same outcome reads
+    differently when Jack is calm, panicking or freezing, so those never share a pool.
+    Each key collects up to `pool_size` distinct generated replies. Until the pool is
+    full every lookup misses (and the caller generates another variant); after that,
+    replies are served at random from the pool, never the same one twice in a row.
+    A generator that keeps repeating itself (the mock) also fills the pool: after
+    `pool_size` duplicate replies the variants collected so far are served.
+
+    Eviction is `lru` (least recently served key) or `lfu` (least served key), plus a TTL.
+    """
+    def __init__(self,
+                 max_keys: int = DEFAULT_RESPONSE_CACHE_SIZE,
+                 pool_size: int = DEFAULT_RESPONSE_POOL_SIZE,
+                 ttl: float = DEFAULT_RESPONSE_CACHE_TTL,
+                 policy: str = DEFAULT_RESPONSE_CACHE_POLICY,
+                 rng: Optional[random.Random] = None):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}' (expected one of {EVICTION_POLICIES})")
+        self.max_keys = max_keys
+        self.pool_size = pool_size
+        self.ttl = ttl
+        self.policy = policy
+        self._rng = rng or random.Random()
+        self._pools: "OrderedDict[Tuple[str, str, str], _Pool]" = OrderedDict()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def stress_bucket(telemetry: Dict) -> str:
+        """Matches the LOW / MEDIUM / HIGH bands of the Stress System in JACK_SYSTEM_PROMPT."""
+        stress = telemetry.get("stress", 0)
+        if stress > 70:
+            return "stress_high"
+        if stress > 30:
+            return "stress_medium"
+        return "stress_low"
+
+    @staticmethod
+    def telemetry_bucket(telemetry: Dict) -> str:
+        """The conditions Jack is told to mention in passing (see Status Reporting)."""
+        return "|".join([
+            "co2_high" if telemetry.get("co2", 0) > 1.0 else "co2_ok",
+            "cold" if telemetry.get("temp", 20) < 5 else "temp_ok",
+            "hr_high" if telemetry.get("heart_rate", 75) > 120 else "hr_ok",
+        ])
+
+    def key(self, scripted_response: str, telemetry: Dict) -> Tuple[str, str, str]:
+        return (scripted_response.strip(), self.stress_bucket(telemetry), self.telemetry_bucket(telemetry))
+
+    def get(self, scripted_response: str, telemetry: Dict) -> Optional[str]:
+        key = self.key(scripted_response, telemetry)
+        pool = self._pools.get(key)
+        if pool is not None and pool.expires_at < time.time():
+            del self._pools[key]
+            self.expirations += 1
+            pool = None
+        if pool is None or not self._ready(pool):
+            self.misses += 1
+            return None
+
+        choices = [i for i in range(len(pool.variants)) if i != pool.last_served] or [0]
+        index = self._rng.choice(choices)
+        pool.last_served = index
+        pool.uses += 1
+        self._pools.move_to_end(key)
+        self.hits += 1
+        return pool.variants[index]
+
+    def put(self, scripted_response: str, telemetry: Dict, reply: str):
+        reply = reply.strip()
+        if not reply or reply.startswith(("[COMM ERROR]", "[API ERROR]")):
+            return # Never pool a failed call
+        key = self.key(scripted_response, telemetry)
+        pool = self._pools.get(key)
+        if pool is None:
+            self._evict(room=1)
+            pool = self._pools[key] = _Pool(time.time() + self.ttl)
+        if reply in pool.variants:
+            pool.duplicates += 1
+        elif len(pool.variants) < self.pool_size:
+            pool.variants.append(reply)
+        self._pools.move_to_end(key)
+
+    def _ready(self, pool: _Pool) -> bool:
+        return len(pool.variants) >= self.pool_size or (pool.variants and pool.duplicates >= self.pool_size)
+
+    def _evict(self, room: int = 0):
+        while self._pools and len(self._pools) > self.max_keys - room:
+            if self.policy == "lfu":
+                # Least served key; ties go to the least recently served (OrderedDict order)
+                victim = min(self._pools, key=lambda k: self._pools[k].uses)
+                del self._pools[victim]
+            else:
+                self._pools.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "keys": len(self._pools),
+            "max_keys": self.max_keys,
+            "pool_size": self.pool_size,
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+_shared_response_cache: Optional[ResponseCache] = None
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache, configured from CARGO_RESPONSE_CACHE_* environment variables."""
+    global _shared_response_cache
+    if _shared_response_cache is None:
+        _shared_response_cache = ResponseCache()
+    return _shared_response_cache
@@ -15,6 +15,17 @@ class PuzzleLogic:
     def apply_effect(self, state: GameState, action: str, target: str) -> str:
         return ""
 
+    def describe_world(self, state: GameState) -> str:
+        """Ground-truth facts the LLM may use to narrate an action it cannot see the result of."""
+        return ""
+
+    def progress(self) -> Dict:
+        """Puzzle state that lives outside the GameState (plain values, for snapshots)."""
+        return {}
+
+    def restore_progress(self, progress: Dict):
+        pass
+
 class CO2CrisisPuzzle(PuzzleLogic):
     """
     Puzzle 1: The CO2 Crisis (MacGyver Moment)
@@ -88,6 +99,32 @@ class CO2CrisisPuzzle(PuzzleLogic):
 
         return ""
 
+    def describe_world(self, state: GameState) -> str:
+        if not self.is_active:
+            return ""
+        inventory = [i.name for i in state.jack.inventory] or ["nothing"]
+        lines = [f"- {place.replace('_', ' ')}: {', '.join(items) if items else 'empty'}"
+                 for place, items in self.world_items.items()]
+        lines.append(f"- Jack is carrying: {', '.join(inventory)}")
+        if self.has_fixed:
+            lines.append("- The CO2 scrubber has been patched and is running.")
+        else:
+            lines.append("- The CO2 scrubber is broken. The spare filter is square, the slot is round; "
+                         "it only fits if sealed with duct tape and plastic hose.")
+        return "\n".join(lines)
+
+    def progress(self) -> Dict:
+        return {
+            "is_active": self.is_active,
+            "has_fixed": self.has_fixed,
+            "world_items": {place: list(items) for place, items in self.world_items.items()}
+        }
+
+    def restore_progress(self, progress: Dict):
+        self.is_active = progress.get("is_active", False)
+        self.has_fixed = progress.get("has_fixed", False)
+        self.world_items = {place: list(items) for place, items in progress.get("world_items", {}).items()}
+
     def _add_to_inventory(self, state: GameState, item_id: str, name: str):
         state.jack.inventory.append(InventoryItem(item_id=item_id, name=name, quantity=1))
 
@@ -118,3 +155,21 @@ class ScenarioManager:
         target = intent.get("target") or ""
         
         return puzzle.handle_interaction(self.state, action, target)
+
+    def describe_world(self) -> str:
+        if not self.active_puzzle_id:
+            return ""
+        return self.puzzles[self.active_puzzle_id].describe_world(self.state)
+
+    def progress(self) -> Dict:
+        """Active puzzle and every puzzle's progress, for snapshots (see MVP/snapshots.py)."""
+        return {
+            "active_puzzle_id": self.active_puzzle_id,
+            "puzzles": {puzzle_id: puzzle.progress() for puzzle_id, puzzle in self.puzzles.items()}
+        }
+
+    def restore_progress(self, progress: Dict):
+        self.active_puzzle_id = progress.get("active_puzzle_id")
+        for puzzle_id, puzzle_progress in progress.get("puzzles", {}).items():
+            if puzzle_id in self.puzzles:
+                self.puzzles[puzzle_id].restore_progress(puzzle_progress)
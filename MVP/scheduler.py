@@ -0,0 +1,135 @@
+"""
+@file scheduler.py
+@description Fixed-timestep scheduler for the physics loop (monotonic clock, accumulator, capped catch-up).
+@module APIServer
+"""
+
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Dict, Tuple
+
+DEFAULT_TICK_RATE = float(os.environ.get("CARGO_TICK_RATE", "1.0"))           # physics steps per second
+DEFAULT_BROADCAST_RATE = float(os.environ.get("CARGO_BROADCAST_RATE", "1.0"))  # telemetry frames per second
+DEFAULT_MAX_CATCH_UP = int(os.environ.get("CARGO_MAX_CATCH_UP_STEPS", "5"))
+
+# Recent wake-up lateness samples kept for the jitter percentiles
+JITTER_WINDOW = 256
+
+# Absorbs float error so a wake-up exactly on the boundary is not treated as early
+_EPSILON = 1e-9
+
+class FixedTimestepScheduler:
+    """
+    Runs `step(delta_time)` at a fixed rate and `broadcast()` at its own (usually lower) rate.
+
+    Elapsed time is measured with `time.monotonic()` and added to an accumulator; every
+    whole `delta_time` in it is consumed by one physics step, so a stall (GC pause, slow
+    broadcast) is made up with extra sub-steps instead of silently losing ticks. At most
+    `max_catch_up` steps run per wake-up: anything beyond is dropped and counted, so a
+    long stall slows the simulation down instead of spiralling. Broadcasts never catch
+    up; they always send the latest state.
+    """
+    def __init__(self,
+                 step: Callable[[float], None],
+                 broadcast: Callable[[], None],
+                 tick_rate: float = DEFAULT_TICK_RATE,
+                 broadcast_rate: float = DEFAULT_BROADCAST_RATE,
+                 max_catch_up: int = DEFAULT_MAX_CATCH_UP,
+                 clock: Callable[[], float] = time.monotonic):
+        self.step = step
+        self.broadcast = broadcast
+        self.delta_time = 1.0 / tick_rate
+        self.broadcast_interval = 1.0 / broadcast_rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+
+        self._last = None
+        self._accumulator = 0.0
+        self._broadcast_accumulator = 0.0
+        self._next_wake = None
+
+        # Metrics
+        self.ticks = 0
+        self.broadcasts = 0
+        self.catch_up_steps = 0  # steps beyond the first in one wake-up
+        self.dropped_steps = 0   # steps discarded by the catch-up cap
+        self.overruns = 0        # wake-ups whose work took longer than one step
+        self.max_work = 0.0
+        self._jitter: Deque[float] = deque(maxlen=JITTER_WINDOW)
+
+    def poll(self) -> Tuple[int, bool]:
+        """
+        Consumes the time elapsed since the last poll.
+        Returns (physics steps to run, whether a broadcast is due). Used by `run()`.
+        """
+        now = self.clock()
+        if self._last is None:
+            self._last = now
+            return 0, False
+        elapsed = now - self._last
+        self._last = now
+        self._accumulator += elapsed
+        self._broadcast_accumulator += elapsed
+
+        steps = int((self._accumulator + _EPSILON) / self.delta_time)
+        if steps > self.max_catch_up:
+            self.dropped_steps += steps - self.max_catch_up
+            self._accumulator -= (steps - self.max_catch_up) * self.delta_time
+            steps = self.max_catch_up
+        self._accumulator -= steps * self.delta_time
+        if steps > 1:
+            self.catch_up_steps += steps - 1
+
+        broadcast_due = self._broadcast_accumulator + _EPSILON >= self.broadcast_interval
+        if broadcast_due:
+            self._broadcast_accumulator = max(0.0, self._broadcast_accumulator - self.broadcast_interval) % self.broadcast_interval
+        return steps, broadcast_due
+
+    def run_once(self) -> float:
+        """One wake-up: runs the due steps and broadcast. Returns seconds until the next step is due."""
+        woke_at = self.clock()
+        if self._next_wake is not None:
+            self._jitter.append(max(0.0, woke_at - self._next_wake))
+
+        steps, broadcast_due = self.poll()
+        for _ in range(steps):
+            self.step(self.delta_time)
+            self.ticks += 1
+        if broadcast_due:
+            self.broadcast()
+            self.broadcasts += 1
+
+        work = self.clock() - woke_at
+        self.max_work = max(self.max_work, work)
+        if work > self.delta_time:
+            self.overruns += 1
+
+        until_step = self.delta_time - self._accumulator
+        until_broadcast = self.broadcast_interval - self._broadcast_accumulator
+        delay = max(0.0, min(until_step, until_broadcast) - work)
+        self._next_wake = self.clock() + delay
+        return delay
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.run_once())
+
+    def stats(self) -> Dict:
+        jitter = sorted(self._jitter)
+        return {
+            "tick_rate": round(1.0 / self.delta_time, 3),
+            "broadcast_rate": round(1.0 / self.broadcast_interval, 3),
+            "ticks": self.ticks,
+            "broadcasts": self.broadcasts,
+            "catch_up_steps": self.catch_up_steps,
+            "dropped_steps": self.dropped_steps,
+            "overruns": self.overruns,
+            "max_work_ms": round(self.max_work * 1000, 3),
+            "jitter_ms": {
+                "mean": round(sum(jitter) / len(jitter) * 1000, 3) if jitter else 0.0,
+                "p99": round(jitter[min(len(jitter) - 1, int(len(jitter) * 0.99))] * 1000, 3) if jitter else 0.0,
+                "max": round(jitter[-1] * 1000, 3) if jitter else 0.0
+            }
+        }
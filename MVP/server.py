@@ -6,13 +6,23 @@
 
 import os
 import asyncio
+import functools
 import json
-import time
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
-from MVP.main import GameEngine
+from MVP.session_manager import SessionManager, SessionLimitError
+from MVP.fanout import ClientChannel, TELEMETRY
+from MVP.scheduler import FixedTimestepScheduler
+from MVP.command_scheduler import DEFAULT_COMMAND_POLICY
+from MVP.ai_middleware import get_intent_cache, intent_batch_stats, intent_path_counts
+from MVP.survivor_jack import prompt_usage
+from MVP.llm_clients import get_model_registry
+from MVP.single_flight import get_single_flight
+from MVP.provider_router import router_stats
+from MVP.response_cache import get_response_cache
 
 app = FastAPI()
 
@@ -24,22 +34,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global Engine Instance
-engine = GameEngine()
+# Session Registry (one GameEngine per player)
+sessions = SessionManager()
 
-# Connected Clients
-clients = []
+# Rewind is a dev/admin tool: off unless enabled, and even then it needs the session's own token
+REWIND_API = os.environ.get("CARGO_REWIND_API", "0") == "1"
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    clients.append(websocket)
-    print("[SERVER] Client Connected")
+
+    # Resume an existing habitat if the client passes ?session=<id>
+    try:
+        session = sessions.get_or_create(websocket.query_params.get("session"))
+    except SessionLimitError as e:
+        print(f"[SERVER] Rejected Client: {e}")
+        await websocket.send_text(json.dumps({"type": "ERROR", "message": "Server full. Try again later."}))
+        await websocket.close(code=1013)
+        return
+
+    engine = session.engine
+    channel = ClientChannel(websocket)
+    channel.start()
+    session.attach(channel)
+    print(f"[SERVER] Client Connected (session {session.session_id})")
     
-    # Send Init
-    await websocket.send_text(json.dumps({
+    # Send Init (carries the full telemetry, i.e. the client's first keyframe)
+    channel.offer(json.dumps({
         "type": "INIT",
         "message": "Connection Established. Telemetry Stream Active.",
+        "session_id": session.session_id,
+        "token": session.token,
         "telemetry": engine.get_telemetry()
     }))
 
@@ -48,59 +73,182 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_text()
             payload = json.loads(data)
             user_input = payload.get("text", "")
-            
-            # Handle Command (Blocking LLM call for now - could be async)
-            # Running in thread pool to not block the physics loop
-            response = await asyncio.to_thread(engine.handle_command, user_input)
-            
-            await websocket.send_text(json.dumps(response))
-            
+            session.touch()
+
+            # Handle Command in the background (CARGO_COMMAND_POLICY decides what a busy session does)
+            session.commands.submit(
+                functools.partial(run_command, engine, channel, user_input, bool(payload.get("stream"))),
+                on_drop=functools.partial(command_dropped, channel, user_input),
+                owner=channel,
+                on_error=functools.partial(command_failed, channel, user_input)
+            )
+
     except WebSocketDisconnect:
-        print("[SERVER] Client Disconnected")
-        clients.remove(websocket)
+        print(f"[SERVER] Client Disconnected (session {session.session_id})")
     except Exception as e:
         print(f"[SERVER] Error: {e}")
-        if websocket in clients:
-            clients.remove(websocket)
         await websocket.close()
+    finally:
+        session.commands.cancel_owner(channel) # Nobody left to read the reply; stop paying for it
+        session.detach(channel)
+        await channel.close()
+
+async def run_command(engine, channel: ClientChannel, user_input: str, stream: bool):
+    """One player command (native async LLM calls, no executor thread held)."""
+    if stream:
+        # Forward Jack's reply token by token (RESPONSE_CHUNK ... RESPONSE_END)
+        async for frame in engine.astream_command(user_input):
+            channel.offer(json.dumps(frame))
+    else:
+        response = await engine.ahandle_command(user_input)
+        channel.offer(json.dumps(response))
+
+def command_dropped(channel: ClientChannel, user_input: str, reason: str, started: bool):
+    """Tells the client a command was cancelled (`started`: its partial RESPONSE_CHUNKs are void) or never ran."""
+    channel.offer(json.dumps({"type": "CANCELLED", "text": user_input, "reason": reason, "started": started}))
+
+def command_failed(channel: ClientChannel, user_input: str, error: BaseException):
+    """Tells the client a command crashed, so it stops waiting for Jack's reply."""
+    channel.offer(json.dumps({"type": "ERROR", "text": user_input, "message": f"Command failed: {error}"}))
+
+# Latest tick result per session; broadcasts always send the newest state
+latest_ticks: dict = {}
+
+def physics_step(delta_time: float):
+    """One fixed physics step for every live session."""
+    # 1. Drop habitats nobody has watched for a while
+    for session_id in sessions.evict_idle():
+        latest_ticks.pop(session_id, None)
+
+    # 2. Tick all Engines
+    latest_ticks.update(sessions.tick_all(delta_time=delta_time))
+
+def broadcast_all():
+    """Fans out the latest telemetry to each session's clients (never awaits a socket)."""
+    for session_id, tick_result in list(latest_ticks.items()):
+        session = sessions.get(session_id)
+        if session is None:
+            del latest_ticks[session_id] # Evicted to make room for a new session
+            continue
+        if not session.clients:
+            continue
+        broadcast(session, tick_result)
+
+scheduler = FixedTimestepScheduler(physics_step, broadcast_all)
 
 async def physics_loop():
-    """Background task to tick the physics engine every second."""
-    print("[SERVER] Physics Loop Started")
-    while True:
-        start_time = time.time()
-        
-        # 1. Tick Engine
-        tick_result = engine.tick(delta_time=1.0)
-        
-        # 2. Broadcast Telemetry to all clients
-        if clients:
-            msg = json.dumps({
-                "type": "TELEMETRY",
-                "telemetry": tick_result['telemetry'],
-                "sensory": tick_result['sensory'] # Optional: Send sensory text for HUD logs
-            })
-            # Broadcast
-            disconnected = []
-            for client in clients:
-                try:
-                    await client.send_text(msg)
-                except Exception:
-                    disconnected.append(client)
-            
-            for d in disconnected:
-                clients.remove(d)
-        
-        # 3. Sleep remainder of 1 second
-        elapsed = time.time() - start_time
-        sleep_time = max(0.0, 1.0 - elapsed)
-        await asyncio.sleep(sleep_time)
+    """Background task: fixed-timestep physics with capped catch-up, broadcasting at its own rate."""
+    print(f"[SERVER] Physics Loop Started ({1.0 / scheduler.delta_time:g} Hz physics, "
+          f"{1.0 / scheduler.broadcast_interval:g} Hz broadcast)")
+    await scheduler.run()
+
+def broadcast(session, tick_result: dict):
+    """Serializes the session's telemetry frame once and enqueues it on every client channel."""
+    telemetry = tick_result['telemetry']
+    sensory = tick_result['sensory'] or session.engine.sensory()
+
+    # Keyframe or changed fields only; nothing at all if the habitat is idle
+    frame = session.telemetry.encode(telemetry, sensory)
+    msg = json.dumps(frame) if frame is not None else None
+    resync_msg = None
+
+    for channel in list(session.clients):
+        if channel.closed:
+            # Writer died or client fell too far behind
+            session.detach(channel)
+            asyncio.create_task(_close_quietly(channel.websocket))
+            continue
+        if channel.needs_resync and not (frame and frame.get("keyframe")):
+            # Lagging client lost deltas: give it a private keyframe instead
+            if resync_msg is None:
+                resync_msg = json.dumps(session.telemetry.snapshot(telemetry, sensory))
+            if channel.offer(resync_msg, TELEMETRY):
+                channel.needs_resync = False
+        elif msg is not None:
+            if channel.offer(msg, TELEMETRY) and frame.get("keyframe"):
+                channel.needs_resync = False
+
+async def _close_quietly(websocket):
+    try:
+        await websocket.close()
+    except Exception:
+        pass
+
+@app.post("/api/sessions/{session_id}/rewind")
+async def rewind_session(session_id: str, seconds: float = 60.0,
+                         x_session_token: Optional[str] = Header(None)):
+    """
+    Rewinds a habitat to its newest checkpoint at least `seconds` of game time old.
+    Needs CARGO_REWIND_API=1 and the `X-Session-Token` the session sent its client in INIT.
+    """
+    if not REWIND_API:
+        raise HTTPException(status_code=404, detail="Not Found")
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown session")
+    if not session.authorize(x_session_token):
+        raise HTTPException(status_code=403, detail="Invalid session token")
+    snapshot = session.rewind(seconds)
+    if snapshot is None:
+        raise HTTPException(status_code=409, detail="No checkpoint that old")
+    latest_ticks.pop(session_id, None)
+    return {
+        "session_id": session_id,
+        "tick": snapshot.tick,
+        "game_time": snapshot.game_time,
+        "telemetry": session.engine.get_telemetry()
+    }
+
+def command_stats() -> dict:
+    """Command scheduling counters summed over live sessions."""
+    totals = {"busy": 0, "waiting": 0, "submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "dropped": 0}
+    for session in sessions.sessions.values():
+        for key, value in session.commands.stats().items():
+            if key in totals:
+                totals[key] += int(value)
+    return {"policy": DEFAULT_COMMAND_POLICY, **totals}
+
+@app.get("/api/stats")
+async def stats():
+    """Per-session fan-out counters (queue depth, dropped frames) for monitoring."""
+    return {
+        "sessions": len(sessions),
+        "dormant_sessions": len(sessions.dormant),
+        "mailbox": {
+            "pending": sum(len(s.engine.mailbox) for s in sessions.sessions.values()),
+            "max_depth": max((s.engine.mailbox.max_depth for s in sessions.sessions.values()), default=0)
+        },
+        "commands": command_stats(),
+        "scheduler": scheduler.stats(),
+        "intent_cache": get_intent_cache().stats(),
+        "intent_paths": dict(intent_path_counts),
+        "intent_batches": intent_batch_stats(),
+        "response_cache": get_response_cache().stats(),
+        "prompt_usage": dict(prompt_usage),
+        "single_flight": get_single_flight().stats(),
+        "providers": router_stats(),
+        "models": get_model_registry().stats(),
+        "clients": {
+            session_id: [channel.stats() for channel in session.clients]
+            for session_id, session in sessions.sessions.items()
+            if session.clients
+        }
+    }
 
 @app.on_event("startup")
 async def startup_event():
+    # Resume saved habitats lazily (no-op unless CARGO_SESSION_SNAPSHOT_PATH is set)
+    sessions.load()
     # Start the physics loop on server startup
     asyncio.create_task(physics_loop())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Keep the intent cache warm across restarts (no-op unless CARGO_INTENT_CACHE_PATH is set)
+    get_intent_cache().save()
+    # Persist every habitat (no-op unless CARGO_SESSION_SNAPSHOT_PATH is set)
+    sessions.save()
+
 # Mount Static Files (Frontend)
 # Must be last to avoid overriding API routes
 frontend_dist = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend", "dist")
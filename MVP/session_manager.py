@@ -0,0 +1,223 @@
+"""
+@file session_manager.py
+@description Creates, looks up and evicts one GameEngine per connected player (multi-session hosting).
+@module APIServer
+"""
+
+import os
+import secrets
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+from MVP.main import GameEngine
+from MVP.telemetry_stream import TelemetryEncoder
+from MVP.command_scheduler import CommandScheduler
+from MVP.scheduler import DEFAULT_TICK_RATE
+from MVP.snapshots import (
+    CheckpointRing, Snapshot, SnapshotError, DEFAULT_CHECKPOINT_INTERVAL, save_snapshots, load_snapshots
+)
+
+# Tunables (overridable via environment for deployment)
+DEFAULT_MAX_SESSIONS = int(os.environ.get("CARGO_MAX_SESSIONS", "500"))
+DEFAULT_IDLE_TIMEOUT = float(os.environ.get("CARGO_SESSION_IDLE_TIMEOUT", "300"))
+# Detached habitats stop ticking and are fast-forwarded when a client reattaches
+SUSPEND_DETACHED = os.environ.get("CARGO_SUSPEND_DETACHED", "1") == "1"
+# Sessions are saved here on shutdown and resumed from it after a restart (unset = off)
+SESSION_SNAPSHOT_PATH = os.environ.get("CARGO_SESSION_SNAPSHOT_PATH") or None
+
+class SessionLimitError(Exception):
+    """Raised when the session cap is reached and no idle session can be evicted."""
+
+class GameSession:
+    """
+    One independent habitat: its own GameEngine plus the sockets watching it.
+    """
+    def __init__(self, session_id: str, engine: GameEngine):
+        self.session_id = session_id
+        self.token = secrets.token_urlsafe(16) # Sent only to this session's own clients (INIT)
+        self.engine = engine
+        self.clients: List = []
+        self.telemetry = TelemetryEncoder()
+        self.created_at = time.monotonic()
+        self.last_active = self.created_at
+        self.suspended_time = 0.0 # Simulated seconds owed while nobody was watching
+        self.tick_seconds = 1.0 / DEFAULT_TICK_RATE # Step those seconds were owed in (set by tick_all)
+        self.checkpoints = CheckpointRing()
+        self.commands = CommandScheduler()
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def authorize(self, token: Optional[str]) -> bool:
+        """True if `token` is the one this session handed to its clients."""
+        return bool(token) and secrets.compare_digest(token.encode(), self.token.encode())
+
+    def attach(self, client):
+        self.resume()
+        if client not in self.clients:
+            self.clients.append(client)
+        self.touch()
+
+    def resume(self):
+        """
+        Catches a suspended habitat up in one closed-form fast-forward, stepped at the
+        physics loop's tick so it ends where live ticking would have.
+        """
+        if self.suspended_time > 0:
+            owed, self.suspended_time = self.suspended_time, 0.0
+            self.engine.fast_forward(owed, delta_time=self.tick_seconds)
+
+    def checkpoint(self, interval: float = 0.0):
+        """Adds a rewind checkpoint, unless the newest one is less than `interval` game seconds old."""
+        latest = self.checkpoints.latest()
+        if latest is None or self.engine.physics.hot.game_time - latest.game_time >= interval - 1e-9:
+            self.checkpoints.add(self.engine.snapshot(latest))
+
+    def rewind(self, seconds: float) -> Optional[Snapshot]:
+        """
+        Restores the newest checkpoint at least `seconds` of game time old.
+        Returns it, or None if there is no checkpoint that old.
+        """
+        self.resume()
+        snapshot = self.checkpoints.rewind(self.engine.physics.hot.game_time - seconds)
+        if snapshot is not None:
+            self.engine.restore(snapshot)
+            self.telemetry.reset() # Clients must not merge deltas across the jump
+        return snapshot
+
+    def detach(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+        self.touch()
+
+    def is_idle(self, now: float, idle_timeout: float) -> bool:
+        """A session is idle when nobody is connected and it has not been touched recently."""
+        return not self.clients and (now - self.last_active) >= idle_timeout
+
+class SessionManager:
+    """
+    Registry of live GameSessions.
+    Enforces a session cap and evicts detached sessions after an idle timeout.
+    Sessions loaded from a snapshot store stay `dormant` (encoded bytes, no engine)
+    until a client resumes them, so a restart restores thousands of habitats in one file read.
+    """
+    def __init__(self,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 engine_factory: Callable[[], GameEngine] = GameEngine,
+                 suspend_detached: bool = SUSPEND_DETACHED,
+                 checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+                 snapshot_path: Optional[str] = SESSION_SNAPSHOT_PATH):
+        self.max_sessions = max_sessions
+        self.suspend_detached = suspend_detached
+        self.idle_timeout = idle_timeout
+        self.engine_factory = engine_factory
+        self.checkpoint_interval = checkpoint_interval
+        self.snapshot_path = snapshot_path
+        self.sessions: Dict[str, GameSession] = {}
+        self.dormant: Dict[str, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def get(self, session_id: Optional[str]) -> Optional[GameSession]:
+        if not session_id:
+            return None
+        return self.sessions.get(session_id)
+
+    def create(self, session_id: Optional[str] = None) -> GameSession:
+        """Creates a new session, evicting idle ones first if the cap is reached."""
+        if len(self.sessions) >= self.max_sessions:
+            self.evict_idle()
+        if len(self.sessions) >= self.max_sessions:
+            self._evict_least_recent_detached()
+        if len(self.sessions) >= self.max_sessions:
+            raise SessionLimitError(f"Session cap reached ({self.max_sessions})")
+
+        session_id = session_id or uuid.uuid4().hex
+        session = GameSession(session_id, self.engine_factory())
+        blob = self.dormant.pop(session_id, None)
+        if blob is not None:
+            try:
+                session.engine.restore(Snapshot.from_bytes(blob))
+                print(f"[SESSION] Restored {session_id} from snapshot")
+            except SnapshotError as e:
+                print(f"[SESSION] Ignoring unreadable snapshot for {session_id}: {e}")
+        self.sessions[session_id] = session
+        print(f"[SESSION] Created {session_id} ({len(self.sessions)}/{self.max_sessions})")
+        return session
+
+    def get_or_create(self, session_id: Optional[str] = None) -> GameSession:
+        """Resumes an existing session (e.g. after a reconnect) or starts a fresh one."""
+        session = self.get(session_id)
+        if session is not None:
+            session.touch()
+            return session
+        return self.create(session_id)
+
+    def evict(self, session_id: str) -> Optional[GameSession]:
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            print(f"[SESSION] Evicted {session_id}")
+        return session
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Drops every detached session whose idle timeout has expired."""
+        now = time.monotonic() if now is None else now
+        expired = [sid for sid, s in self.sessions.items() if s.is_idle(now, self.idle_timeout)]
+        for sid in expired:
+            self.evict(sid)
+        return expired
+
+    def _evict_least_recent_detached(self):
+        detached = [s for s in self.sessions.values() if not s.clients]
+        if detached:
+            oldest = min(detached, key=lambda s: s.last_active)
+            self.evict(oldest.session_id)
+
+    def tick_all(self, delta_time: float = 1.0) -> Dict[str, dict]:
+        """
+        Advances every live session by one tick in a single pass.
+        Detached sessions are only charged the time (see GameSession.resume) when suspension is on.
+        Returns tick results keyed by session_id (watched sessions only, when suspending).
+        """
+        results = {}
+        for session_id, session in list(self.sessions.items()):
+            if self.suspend_detached and not session.clients:
+                session.suspended_time += delta_time
+                session.tick_seconds = delta_time
+                continue
+            # Sensory text is built lazily at broadcast time (see server.broadcast)
+            results[session_id] = session.engine.tick(delta_time=delta_time, include_sensory=False)
+            if self.checkpoint_interval:
+                session.checkpoint(self.checkpoint_interval)
+        return results
+
+    # --- Persistence ---
+
+    def save(self, path: Optional[str] = None):
+        """Writes every live and dormant session to the snapshot store (no-op without a path)."""
+        path = path or self.snapshot_path
+        if not path:
+            return
+        blobs = dict(self.dormant)
+        for session_id, session in self.sessions.items():
+            session.resume()
+            blobs[session_id] = session.engine.snapshot().to_bytes()
+        save_snapshots(path, blobs)
+        print(f"[SESSION] Saved {len(blobs)} sessions to {path}")
+
+    def load(self, path: Optional[str] = None):
+        """Reads the snapshot store; its sessions stay dormant until a client resumes them."""
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            return
+        try:
+            blobs = load_snapshots(path)
+        except (OSError, SnapshotError) as e:
+            print(f"[SESSION] Ignoring unreadable session store {path}: {e}")
+            return
+        for session_id, blob in blobs.items():
+            if session_id not in self.sessions:
+                self.dormant[session_id] = blob
+        print(f"[SESSION] Loaded {len(blobs)} dormant sessions from {path}")
@@ -0,0 +1,100 @@
+"""
+@file single_flight.py
+@description Coalesces identical concurrent LLM requests (across sessions) into one upstream call.
+@module AIInterpreter
+"""
+
+import os
+import json
+import asyncio
+import hashlib
+import functools
+from typing import Awaitable, Callable, Dict, List, Optional
+
+SINGLE_FLIGHT_ENABLED = os.environ.get("CARGO_LLM_SINGLE_FLIGHT", "1") == "1"
+
+def request_key(provider: str, model: str, messages: List[Dict], **params) -> str:
+    """Hash of everything that determines an LLM request: provider, model, messages and parameters."""
+    payload = json.dumps([provider, model, messages, params], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    While a request is in flight, identical requests (same `request_key`) wait for its
+    result instead of calling the provider again. Many sessions play the same scenario,
+    so the same intent parse or scripted-result prompt often arrives at the same moment.
+
+    The upstream call runs as its own task. A waiter that is cancelled (e.g. its command
+    was superseded) leaves the others untouched; the upstream call is cancelled only when
+    its last waiter goes. Nothing is kept once the call lands: this is not a cache.
+    """
+    def __init__(self, enabled: bool = SINGLE_FLIGHT_ENABLED):
+        self.enabled = enabled
+        self._flights: Dict[str, _Flight] = {}
+
+        # Metrics
+        self.requests = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.abandoned = 0 # Upstream calls cancelled because every waiter left
+
+    async def run(self, key: str, call: Callable[[], Awaitable]):
+        """
+        Returns the result of `call()` (a coroutine factory, only invoked by the first
+        caller for `key`), sharing it with every identical request made meanwhile.
+        """
+        self.requests += 1
+        if not self.enabled:
+            self.upstream_calls += 1
+            return await call()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            self.upstream_calls += 1
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(functools.partial(self._landed, key, flight))
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                self.abandoned += 1
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _landed(self, key: str, flight: _Flight, task: asyncio.Task):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "requests": self.requests,
+            "upstream_calls": self.upstream_calls,
+            "coalesced": self.coalesced,
+            "abandoned": self.abandoned,
+            "coalescing_ratio": round(self.coalesced / self.requests, 4) if self.requests else 0.0
+        }
+
+_single_flight: Optional[SingleFlight] = None
+
+def get_single_flight() -> SingleFlight:
+    """Process-wide instance, so identical requests from every session are coalesced."""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,200 @@
+"""
+@file snapshots.py
+@description Portable snapshots of a habitat (GameState + puzzle progress), rewind checkpoints and the session store.
+@module PhysicsSimulation
+"""
+
+import os
+import json
+import zlib
+import struct
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+from pydantic import ValidationError
+from pydantic_core import from_json, to_json
+from MVP.state_schema import GameState
+
+DEFAULT_CHECKPOINT_INTERVAL = float(os.environ.get("CARGO_CHECKPOINT_INTERVAL", "60"))  # game seconds, 0 = off
+DEFAULT_CHECKPOINT_LIMIT = int(os.environ.get("CARGO_CHECKPOINT_LIMIT", "10"))
+SNAPSHOT_COMPRESSION = int(os.environ.get("CARGO_SNAPSHOT_COMPRESSION", "0")) # zlib level for to_bytes, 0 = off
+
+FORMAT_VERSION = 2
+_SNAPSHOT_MAGIC = b"CRGO"
+_STORE_MAGIC = b"CRGS"
+_HEADER = struct.Struct("<4sHI") # magic, format version, schema fingerprint
+_META = struct.Struct("<qdH")    # tick, game time, section count
+_LENGTH = struct.Struct("<I")
+_RAW, _ZLIB = b"\x00", b"\x01" # body encoding flag
+
+class SnapshotError(Exception):
+    """Raised for snapshot data that is corrupt or was written by an incompatible schema."""
+
+# --- Section Codec ---
+# Each GameState section is its own pydantic JSON blob, so checkpoints can share unchanged
+# sections. JSON is portable across Python versions, unlike marshal or pickle, and decoding
+# reassembles one document for a single `model_validate_json` pass in pydantic-core.
+
+_SECTIONS: List[str] = list(GameState.model_fields)
+_SERIALIZERS = [GameState.model_fields[name].annotation.__pydantic_serializer__ for name in _SECTIONS]
+_SECTION_KEYS: List[bytes] = [json.dumps(name).encode() + b":" for name in _SECTIONS]
+_SECTION_COUNT = len(_SECTIONS) + 2 # + physics extras, scenario progress
+
+# Full JSON schema (types, Literals, defaults), so any model change rejects old snapshots
+SCHEMA_FINGERPRINT = zlib.crc32(json.dumps(GameState.model_json_schema(), sort_keys=True).encode())
+
+def _pack(blobs: Tuple[bytes, ...]) -> bytes:
+    return b"".join(_LENGTH.pack(len(blob)) + blob for blob in blobs)
+
+def _unpack(data: bytes, offset: int, count: int) -> Tuple[List[bytes], int]:
+    blobs = []
+    for _ in range(count):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        blob = data[offset:offset + length]
+        if len(blob) != length:
+            raise SnapshotError("Truncated snapshot")
+        blobs.append(blob)
+        offset += length
+    return blobs, offset
+
+# --- Snapshots ---
+
+class Snapshot(NamedTuple):
+    """
+    One habitat at one tick: a tuple of immutable per-section JSON blobs (the GameState
+    sections, then physics extras, then scenario progress). Blobs are shared between snapshots
+    whenever a section did not change, which makes a ring of checkpoints copy-on-write.
+    """
+    tick: int
+    game_time: float
+    sections: Tuple[bytes, ...]
+
+    def to_bytes(self) -> bytes:
+        body = _META.pack(self.tick, self.game_time, len(self.sections)) + _pack(self.sections)
+        if SNAPSHOT_COMPRESSION:
+            body = _ZLIB + zlib.compress(body, SNAPSHOT_COMPRESSION)
+        else:
+            body = _RAW + body
+        return _HEADER.pack(_SNAPSHOT_MAGIC, FORMAT_VERSION, SCHEMA_FINGERPRINT) + body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Snapshot":
+        _check_header(data, _SNAPSHOT_MAGIC)
+        flag, body = data[_HEADER.size:_HEADER.size + 1], data[_HEADER.size + 1:]
+        try:
+            if flag == _ZLIB:
+                body = zlib.decompress(body)
+            elif flag != _RAW:
+                raise SnapshotError("Corrupt snapshot: unknown encoding")
+            tick, game_time, count = _META.unpack_from(body)
+            if count != _SECTION_COUNT:
+                raise SnapshotError(f"Snapshot has {count} sections, expected {_SECTION_COUNT}")
+            sections, end = _unpack(body, _META.size, count)
+        except (zlib.error, struct.error) as e:
+            raise SnapshotError(f"Corrupt snapshot: {e}") from e
+        if end != len(body):
+            raise SnapshotError("Corrupt snapshot: trailing data")
+        return cls(tick, game_time, tuple(sections))
+
+    @property
+    def size(self) -> int:
+        return sum(len(blob) for blob in self.sections)
+
+def _check_header(data: bytes, magic: bytes):
+    if len(data) < _HEADER.size:
+        raise SnapshotError("Truncated snapshot header")
+    found, version, fingerprint = _HEADER.unpack_from(data)
+    if found != magic:
+        raise SnapshotError("Not a CARGO snapshot")
+    if version != FORMAT_VERSION or fingerprint != SCHEMA_FINGERPRINT:
+        raise SnapshotError(f"Snapshot written by another schema (format {version}, schema {fingerprint:08x})")
+
+def capture(state: GameState, previous_temperature: float, progress: Dict,
+            previous: Optional[Snapshot] = None) -> Snapshot:
+    """
+    Encodes the state. The GameState must be current (call PhysicsSimulator.sync() first).
+    Sections equal to those of `previous` reuse its blob objects instead of new copies.
+    """
+    blobs = [serializer.to_json(getattr(state, name)) for name, serializer in zip(_SECTIONS, _SERIALIZERS)]
+    blobs.append(to_json([previous_temperature]))
+    blobs.append(to_json(progress))
+    if previous is not None:
+        blobs = [old if old == new else new for old, new in zip(previous.sections, blobs)]
+    return Snapshot(state.metadata.simulation_tick, state.metadata.game_time_seconds, tuple(blobs))
+
+def restore_state(snapshot: Snapshot) -> Tuple[GameState, float, Dict]:
+    """
+    Returns (GameState, physics previous_temperature, scenario progress).
+    Anything that does not decode or validate raises SnapshotError.
+    """
+    document = b"{" + b",".join(key + blob for key, blob in zip(_SECTION_KEYS, snapshot.sections)) + b"}"
+    try:
+        state = GameState.model_validate_json(document)
+        (previous_temperature,) = from_json(snapshot.sections[-2])
+        progress = from_json(snapshot.sections[-1])
+    except (ValidationError, ValueError, TypeError) as e:
+        raise SnapshotError(f"Corrupt snapshot: {e}") from e
+    if not isinstance(progress, dict):
+        raise SnapshotError("Corrupt snapshot: progress is not an object")
+    return state, previous_temperature, progress
+
+# --- Rewind Checkpoints ---
+
+class CheckpointRing:
+    """
+    The last `limit` snapshots of one habitat, oldest first.
+    Consecutive checkpoints share every section that did not change between them,
+    so a long idle stretch costs little more than one snapshot.
+    """
+    def __init__(self, limit: int = DEFAULT_CHECKPOINT_LIMIT):
+        self.checkpoints: Deque[Snapshot] = deque(maxlen=limit)
+
+    def __len__(self) -> int:
+        return len(self.checkpoints)
+
+    def latest(self) -> Optional[Snapshot]:
+        return self.checkpoints[-1] if self.checkpoints else None
+
+    def add(self, snapshot: Snapshot):
+        self.checkpoints.append(snapshot)
+
+    def rewind(self, game_time: float) -> Optional[Snapshot]:
+        """Newest checkpoint taken at or before `game_time`; newer ones are discarded."""
+        while self.checkpoints and self.checkpoints[-1].game_time > game_time:
+            self.checkpoints.pop()
+        return self.latest()
+
+    def stats(self) -> Dict:
+        unique = {id(blob): len(blob) for snapshot in self.checkpoints for blob in snapshot.sections}
+        return {
+            "checkpoints": len(self.checkpoints),
+            "bytes": sum(unique.values()),
+            "unshared_bytes": sum(snapshot.size for snapshot in self.checkpoints)
+        }
+
+# --- Session Store (persistence across restarts) ---
+
+def save_snapshots(path: str, blobs: Dict[str, bytes]):
+    """Writes {session_id: Snapshot.to_bytes()} to `path` atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_STORE_MAGIC, FORMAT_VERSION, SCHEMA_FINGERPRINT))
+        f.write(_LENGTH.pack(len(blobs)))
+        for session_id, blob in blobs.items():
+            f.write(_pack((session_id.encode(), blob)))
+    os.replace(tmp_path, path)
+
+def load_snapshots(path: str) -> Dict[str, bytes]:
+    """Reads a session store. Snapshots are decoded later, one by one, when a session is resumed."""
+    with open(path, "rb") as f:
+        data = f.read()
+    _check_header(data, _STORE_MAGIC)
+    try:
+        (count,) = _LENGTH.unpack_from(data, _HEADER.size)
+        entries, end = _unpack(data, _HEADER.size + _LENGTH.size, count * 2)
+        blobs = {entries[i].decode(): entries[i + 1] for i in range(0, len(entries), 2)}
+    except (struct.error, UnicodeDecodeError) as e:
+        raise SnapshotError(f"Corrupt session store: {e}") from e
+    if end != len(data):
+        raise SnapshotError("Corrupt session store: trailing data")
+    return blobs
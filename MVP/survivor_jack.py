@@ -4,17 +4,164 @@
 @module PersonaManagement
 """
 
+import re
 import time
 import os
-from typing import Optional
+import json
+import asyncio
+from collections import Counter
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional
+from MVP.llm_limits import get_limiter
+from MVP.provider_router import ProviderUnavailable, get_provider_health, hedged, pick_provider
+from MVP.single_flight import get_single_flight, request_key
+from MVP.llm_clients import get_model_registry
+from MVP.conversation_memory import ConversationMemory
+from MVP.prompts import estimate_tokens
+
+# Prompt size totals across all sessions (exposed via /api/stats)
+prompt_usage: Counter = Counter()
+
+def usage_from_response(response) -> Dict:
+    """Provider-reported prompt token counts (OpenAI `usage`, Gemini `usage_metadata`), if present."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        details = getattr(usage, "prompt_tokens_details", None)
+        return {
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "cached_tokens": getattr(details, "cached_tokens", None) or 0
+        }
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is not None:
+        return {
+            "prompt_tokens": getattr(metadata, "prompt_token_count", None),
+            "cached_tokens": getattr(metadata, "cached_content_token_count", None) or 0
+        }
+    return {}
+
+class StreamInterrupted(Exception):
+    """
+    Raised by `aspeak_stream` when the provider fails or times out, possibly after part of
+    the reply was already yielded. The message is the text to show the player.
+    """
+
+class ThoughtFilter:
+    """
+    Strips the [INTERNAL THOUGHT] section (see Response Format in prompts.py) from a
+    streamed reply on the fly. Text is held back only while it could still be the
+    start of a tag, so the first [RESPONSE] tokens reach the player immediately.
+
+    Tags are matched case-insensitively, also when wrapped in markdown ("**[RESPONSE]**:").
+    Reply sections separated by a thought are joined with one space, and trailing whitespace
+    is held until more reply text follows, so the streamed text always equals `strip_thought`.
+    A reply that is only a thought yields FALLBACK_REPLY instead of the thought.
+    """
+    TAG = re.compile(r"[*_]{0,3}\[(internal thought|response)\][*_]{0,3}:?", re.IGNORECASE)
+    TAG_NAMES = ("[internal thought]", "[response]")
+    FALLBACK_REPLY = "...Copy. Stand by."
+    _MAX_TAG = 28 # Longest possible tag match, wrappers included
+
+    def __init__(self):
+        self.state = "response" # Text before any tag is reply (the model may skip the format)
+        self.buffer = ""
+        self.pending_space = "" # Trailing whitespace, emitted only if more reply text follows
+        self.join = False       # A thought ended since the last emitted reply text
+        self.emitted = False
+        self.saw_thought = False
+
+    def feed(self, chunk: str) -> str:
+        self.buffer += chunk
+        return self._drain(final=False)
+
+    def flush(self) -> str:
+        """Returns whatever is still buffered once the stream ends."""
+        text = self._drain(final=True)
+        if not self.emitted and self.saw_thought:
+            # No reply section at all: the thought is never shown, say something neutral
+            text = self.FALLBACK_REPLY
+            self.emitted = True
+        return text
+
+    def _drain(self, final: bool) -> str:
+        out = []
+        while True:
+            match = self.TAG.search(self.buffer)
+            # A tag at the very end may still grow ("**[RESPONSE]*" + "*"), so wait for more
+            if match and (final or match.end() < len(self.buffer)):
+                self._section_text(self.buffer[:match.start()], out)
+                self.buffer = self.buffer[match.end():]
+                if match.group(1).lower() == "internal thought":
+                    self.state, self.saw_thought = "thought", True
+                else:
+                    self.state = "response"
+                self.join = self.emitted
+                continue
+            cut = len(self.buffer) if final else self._held_tail(self.buffer)
+            if match:
+                cut = min(cut, match.start())
+            self._section_text(self.buffer[:cut], out)
+            self.buffer = self.buffer[cut:]
+            return "".join(out)
+
+    def _section_text(self, text: str, out: List[str]):
+        if self.state != "response" or not text:
+            return
+        body = text.rstrip()
+        if not body:
+            if self.emitted and not self.join:
+                self.pending_space += text
+            return
+        if not self.emitted:
+            out.append(body.lstrip())
+        elif self.join:
+            out.append(" " + body.lstrip())
+        else:
+            out.append(self.pending_space + body)
+        self.pending_space = text[len(body):]
+        self.emitted = True
+        self.join = False
+
+    def _held_tail(self, text: str) -> int:
+        """Index from which `text` might be an unfinished tag (len(text) if none)."""
+        for i in range(max(0, len(text) - self._MAX_TAG), len(text)):
+            if text[i] in "[*_" and self._is_tag_prefix(text[i:]):
+                return i
+        return len(text)
+
+    def _is_tag_prefix(self, text: str) -> bool:
+        rest = text.lstrip("*_")
+        if len(text) - len(rest) > 3:
+            return False
+        if not rest:
+            return True # A markdown wrapper that may open a tag
+        return any(name.startswith(rest.lower()) for name in self.TAG_NAMES)
+
+def strip_thought(text: str) -> str:
+    """Non-streaming variant of ThoughtFilter: returns only the [RESPONSE] part of a reply."""
+    thought_filter = ThoughtFilter()
+    return thought_filter.feed(text) + thought_filter.flush()
+
+class LLMBackend(NamedTuple):
+    """One configured provider: its shared clients and the model Jack uses on it."""
+    provider: str
+    model: str
+    client: Any
+    async_client: Any
 
 class SurvivorJack:
-    def __init__(self, use_mock: bool = True):
+    def __init__(self, use_mock: bool = True, memory: Optional[ConversationMemory] = None):
         self.use_mock = use_mock
         self.name = "Jack"
         self.client = None
+        self.async_client = None
         self.provider = "mock" # 'openai', 'google', 'mock'
         self.model = "gpt-3.5-turbo" 
+        self.backends: Dict[str, LLMBackend] = {} # Preference order; the first one is `provider`
+        self.last_usage: Dict = {}
+
+        # Per-session conversation state (models and clients are shared, see llm_clients.py)
+        self.memory = memory if memory is not None else ConversationMemory()
+        self._chat = None
+        self._chat_system: Optional[str] = None
         
         if not self.use_mock:
             self._setup_client()
@@ -22,28 +169,27 @@ class SurvivorJack:
     def _setup_client(self):
         """Initializes the LLM client based on api_key.txt or env vars"""
         try:
-            api_key = None
-            base_url = None
+            api_key = os.environ.get("OPENAI_API_KEY")
+            base_url = os.environ.get("OPENAI_BASE_URL") or None
             google_key = os.environ.get("GOOGLE_API_KEY") # Check Env first
             
             # Legacy file check removed for security
             
-            # Priority: Google Key (Env) > OpenAI Key
+            # Priority: Google Key (Env) > OpenAI Key. With both, async calls hedge/fail over to the second.
             if google_key:
-                import google.generativeai as genai
-                genai.configure(api_key=google_key)
-                self.client = genai
-                self.provider = "google"
-                self.model = "gemini-3-pro-preview" # Confirmed available via list_models.py
-                print(f"[SYSTEM] Using Google Generative AI (Model: {self.model})")
-                return
+                genai = get_model_registry().google(google_key) # Same module exposes *_async methods
+                model = "gemini-3-pro-preview" # Confirmed available via list_models.py
+                self.backends["google"] = LLMBackend("google", model, genai, genai)
+                print(f"[SYSTEM] Using Google Generative AI (Model: {model})")
 
             if api_key:
-                from openai import OpenAI
-                self.client = OpenAI(api_key=api_key, base_url=base_url)
-                self.provider = "openai"
-                self.model = "gpt-4o-mini" # Default for OpenAI compatible
-                print(f"[SYSTEM] Using OpenAI Compatible API (Model: {self.model})")
+                client, async_client = get_model_registry().openai_clients(api_key, base_url)
+                model = "gpt-4o-mini" # Default for OpenAI compatible
+                self.backends["openai"] = LLMBackend("openai", model, client, async_client)
+                print(f"[SYSTEM] Using OpenAI Compatible API (Model: {model})")
+
+            if self.backends:
+                self.provider, self.model, self.client, self.async_client = next(iter(self.backends.values()))
                 return
 
             print("[WARNING] No valid API Key found. Falling back to Mock.")
@@ -58,6 +204,7 @@ class SurvivorJack:
     def speak(self, system_prompt: str, user_prompt: str) -> str:
         if self.use_mock:
             print("[DEBUG] Using Mock Response")
+            self._record_usage(system_prompt, user_prompt)
             return self._mock_response(user_prompt)
         
         if self.provider == "google":
@@ -70,9 +217,249 @@ class SurvivorJack:
             # Should not happen if use_mock is False and setup succeeded
             raise RuntimeError("Provider not configured correctly in Strict Mode")
 
+    async def aspeak(self, system_prompt: str, user_prompt: str) -> str:
+        """
+        Native async variant of `speak`. Uses the providers' async clients under the
+        shared per-provider concurrency limit, so no executor thread is held per request.
+        With two providers configured, a slow call is hedged and a failing one fails over.
+        """
+        if self.use_mock:
+            await asyncio.sleep(0.3)
+            self._record_usage(system_prompt, user_prompt)
+            return self._mock_text(user_prompt)
+
+        if not self.backends:
+            raise RuntimeError("Provider not configured correctly in Strict Mode")
+
+        calls = {"google": self._google_call_async, "openai": self._openai_call_async}
+        # Identical requests in flight (same prompt and history) share one upstream call
+        key = request_key(self.provider, self.model, self._openai_messages(system_prompt, user_prompt),
+                          temperature=0.7, max_tokens=150)
+        try:
+            return await get_single_flight().run(key, lambda: self._routed(calls, system_prompt, user_prompt))
+        except asyncio.TimeoutError:
+            return "[COMM ERROR]: Signal interference. (timed out)"
+        except Exception as e:
+            return f"[COMM ERROR]: Signal interference. ({str(e)})"
+
+    async def aspeak_json(self, system_prompt: str, user_prompt: str) -> Optional[Dict]:
+        """
+        Single structured call in JSON mode. Returns the parsed object, or None if the
+        provider is unavailable or the output does not parse (callers fall back).
+        """
+        if self.use_mock or not self.backends:
+            return None
+
+        calls = {"google": self._google_json_async, "openai": self._openai_json_async}
+
+        key = request_key(self.provider, self.model,
+                          [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+                          temperature=0.7, max_tokens=300, response_format="json_object")
+        try:
+            content = await get_single_flight().run(key, lambda: self._routed(calls, system_prompt, user_prompt))
+            if "```" in content:
+                content = content.split("```")[1].removeprefix("json")
+            parsed = json.loads(content)
+            return parsed if isinstance(parsed, dict) else None
+        except Exception as e:
+            print(f"[JACK] Structured Output Error: {e}")
+            return None
+
+    async def _routed(self, calls: Dict[str, Callable], system_prompt: str, user_prompt: str):
+        """One call routed over the configured providers (see provider_router.hedged)."""
+        _, result = await hedged([
+            (provider, lambda call=calls[provider], provider=provider:
+                get_limiter(provider).run(call(system_prompt, user_prompt)))
+            for provider in self.backends
+        ])
+        return result
+
+    async def _openai_json_async(self, system_prompt: str, user_prompt: str) -> str:
+        backend = self.backends["openai"]
+        response = await backend.async_client.chat.completions.create(
+            model=backend.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.7,
+            max_tokens=300,
+            response_format={"type": "json_object"}
+        )
+        self._record_usage(system_prompt, user_prompt, response)
+        return response.choices[0].message.content
+
+    async def _google_json_async(self, system_prompt: str, user_prompt: str) -> str:
+        backend = self.backends["google"]
+        model = get_model_registry().google_model(
+            backend.async_client,
+            backend.model,
+            system_instruction=system_prompt,
+            generation_config={"response_mime_type": "application/json"}
+        )
+        response = await model.generate_content_async(user_prompt)
+        self._record_usage(system_prompt, user_prompt, response)
+        return response.text
+
+    async def aspeak_stream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        """
+        Streams Jack's reply as it is generated, with the [INTERNAL THOUGHT] section removed.
+        Holds one provider concurrency slot until the stream finishes, stalls (no chunk for
+        CARGO_LLM_STREAM_IDLE_TIMEOUT) or overruns CARGO_LLM_STREAM_TIMEOUT.
+        A failed stream raises StreamInterrupted instead of yielding error text, so a
+        half-finished reply is never mistaken for a complete one.
+        """
+        thought_filter = ThoughtFilter()
+        health = None
+
+        if self.use_mock:
+            raw = self._stream_mock(user_prompt)
+            limiter = None
+            self._record_usage(system_prompt, user_prompt)
+        elif self.backends:
+            # Streams are not hedged, but skip a provider whose circuit breaker is open
+            try:
+                provider = pick_provider(list(self.backends))
+            except ProviderUnavailable as e:
+                raise StreamInterrupted(f"[COMM ERROR]: Signal interference. ({str(e)})") from e
+            if provider == "google":
+                raw = self._google_stream(system_prompt, user_prompt)
+            else:
+                raw = self._openai_stream(system_prompt, user_prompt)
+            limiter = get_limiter(provider)
+            health = get_provider_health(provider)
+        else:
+            raise RuntimeError("Provider not configured correctly in Strict Mode")
+
+        try:
+            if limiter is None:
+                async for chunk in raw:
+                    text = thought_filter.feed(chunk)
+                    if text:
+                        yield text
+            else:
+                async with limiter.slot(): # Released on success, error, timeout and cancellation
+                    bounded = limiter.bounded(raw)
+                    try:
+                        async for chunk in bounded:
+                            text = thought_filter.feed(chunk)
+                            if text:
+                                yield text
+                    finally:
+                        await bounded.aclose()
+        except asyncio.TimeoutError as e:
+            if health is not None:
+                health.record_failure()
+            raise StreamInterrupted("[COMM ERROR]: Signal interference. (timed out)") from e
+        except Exception as e:
+            if health is not None:
+                health.record_failure()
+            raise StreamInterrupted(f"[COMM ERROR]: Signal interference. ({str(e)})") from e
+        finally:
+            await raw.aclose() # Also on cancellation: stops the provider stream mid-reply
+            if health is not None:
+                health.release_trial()
+
+        if health is not None:
+            health.record_success()
+
+        tail = thought_filter.flush()
+        if tail:
+            yield tail
+
+    def _google_chat(self, system_prompt: str):
+        """
+        This session's Gemini chat, started once on the shared model and reused per command.
+        Its history is reset from `memory` before each send, so it never grows past the budget.
+        """
+        if self._chat is None or self._chat_system != system_prompt:
+            backend = self.backends["google"]
+            model = get_model_registry().google_model(backend.client, backend.model, system_instruction=system_prompt)
+            self._chat = model.start_chat(history=[])
+            self._chat_system = system_prompt
+        self._chat.history = [
+            {"role": "model" if m["role"] == "assistant" else "user", "parts": [m["content"]]}
+            for m in self.memory.messages()
+        ]
+        return self._chat
+
+    def _openai_messages(self, system_prompt: str, user_prompt: str) -> List[Dict]:
+        return (
+            [{"role": "system", "content": system_prompt}]
+            + self.memory.messages()
+            + [{"role": "user", "content": user_prompt}]
+        )
+
+    def _record_usage(self, system_prompt: str, user_prompt: str, response=None):
+        """
+        Logs the prompt size of one call. The system/turn split is estimated locally;
+        prompt_tokens and cached_tokens come from the provider when it reports them
+        (cached_tokens > 0 means the stable system prefix hit the provider's prompt cache).
+        """
+        usage = {
+            "system_tokens_est": estimate_tokens(system_prompt),
+            "turn_tokens_est": estimate_tokens(user_prompt)
+        }
+        if response is not None:
+            usage.update(usage_from_response(response))
+        self.last_usage = usage
+
+        prompt_usage["calls"] += 1
+        prompt_usage["system_tokens_est"] += usage["system_tokens_est"]
+        prompt_usage["turn_tokens_est"] += usage["turn_tokens_est"]
+        reported = ""
+        if usage.get("prompt_tokens"):
+            prompt_usage["prompt_tokens"] += int(usage["prompt_tokens"])
+            prompt_usage["cached_tokens"] += int(usage["cached_tokens"])
+            reported = f" | provider: {usage['prompt_tokens']} prompt, {usage['cached_tokens']} cached"
+        print(f"[PROMPT] system~{usage['system_tokens_est']} + turn~{usage['turn_tokens_est']} tokens{reported}")
+
+    async def _stream_mock(self, prompt: str) -> AsyncIterator[str]:
+        await asyncio.sleep(0.1)
+        for word in self._mock_text(prompt).split(" "):
+            await asyncio.sleep(0.02)
+            yield word + " "
+
+    async def _openai_stream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        backend = self.backends["openai"]
+        stream = await asyncio.wait_for(
+            backend.async_client.chat.completions.create(
+                model=backend.model,
+                messages=self._openai_messages(system_prompt, user_prompt),
+                temperature=0.7,
+                max_tokens=150,
+                stream=True,
+                stream_options={"include_usage": True}
+            ),
+            get_limiter("openai").timeout
+        )
+        usage_chunk = None
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage_chunk = chunk # Final chunk carries usage, with no choices
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close() # Drops the HTTP response if the command was cancelled
+        self._record_usage(system_prompt, user_prompt, usage_chunk)
+
+    async def _google_stream(self, system_prompt: str, user_prompt: str) -> AsyncIterator[str]:
+        response = await asyncio.wait_for(
+            self._google_chat(system_prompt).send_message_async(user_prompt, stream=True),
+            get_limiter("google").timeout
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+        self._record_usage(system_prompt, user_prompt, response)
+
     def _mock_response(self, prompt: str) -> str:
-        prompt_lower = prompt.lower()
         time.sleep(0.3)
+        return self._mock_text(prompt)
+
+    def _mock_text(self, prompt: str) -> str:
+        prompt_lower = prompt.lower()
         if "hummmmm" in prompt_lower:
             return "Whoa... hear that? It's humming. Lights are on! You actually know your stuff, boss."
         if "sparks!" in prompt_lower or "smoking" in prompt_lower:
@@ -91,27 +478,37 @@ class SurvivorJack:
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=self._openai_messages(system_prompt, user_prompt),
                 temperature=0.7,
                 max_tokens=150
             )
+            self._record_usage(system_prompt, user_prompt, response)
             return response.choices[0].message.content.strip()
         except Exception as e:
             return f"[COMM ERROR]: Signal interference. ({str(e)})"
 
     def _google_call(self, system_prompt: str, user_prompt: str) -> str:
         try:
-            model = self.client.GenerativeModel(
-                model_name=self.model,
-                system_instruction=system_prompt
-            )
-            
-            chat = model.start_chat(history=[])
-            response = chat.send_message(user_prompt)
+            response = self._google_chat(system_prompt).send_message(user_prompt)
+            self._record_usage(system_prompt, user_prompt, response)
             return response.text.strip()
         except Exception as e:
             # Return error directly so user sees it wasn't a mock response
             return f"[API ERROR] {str(e)}"
+
+    async def _openai_call_async(self, system_prompt: str, user_prompt: str) -> str:
+        """Raises on failure (unlike the sync call) so the router can fail over; aspeak reports it."""
+        backend = self.backends["openai"]
+        response = await backend.async_client.chat.completions.create(
+            model=backend.model,
+            messages=self._openai_messages(system_prompt, user_prompt),
+            temperature=0.7,
+            max_tokens=150
+        )
+        self._record_usage(system_prompt, user_prompt, response)
+        return response.choices[0].message.content.strip()
+
+    async def _google_call_async(self, system_prompt: str, user_prompt: str) -> str:
+        response = await self._google_chat(system_prompt).send_message_async(user_prompt)
+        self._record_usage(system_prompt, user_prompt, response)
+        return response.text.strip()
@@ -0,0 +1,98 @@
+"""
+@file telemetry_stream.py
+@description Delta-encoded telemetry protocol: keyframes on connect/resync, changed fields only in between.
+@module APIServer
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+DEFAULT_RESYNC_INTERVAL = int(os.environ.get("CARGO_TELEMETRY_RESYNC_INTERVAL", "30"))
+
+# Minimum change before a field is re-sent. Fields not listed are sent on any change.
+DEFAULT_DEADBANDS = {
+    "co2": 0.001,
+    "temp": 0.1,
+    "pressure": 0.1,
+    "o2": 0.1,
+    "stress": 0.1,
+    "battery": 0.1,
+    "power_draw": 0.1,
+}
+
+# Absorbs float noise on values that were already rounded by get_telemetry()
+_EPSILON = 1e-9
+
+class TelemetryEncoder:
+    """
+    Turns the per-tick telemetry dict into protocol frames for one session.
+
+    Frame types:
+      - TELEMETRY        keyframe, full telemetry + sensory text ("keyframe": true)
+      - TELEMETRY_DELTA  only the fields that moved past their deadband
+    Values in a delta are absolute, so a client simply merges them over its last state.
+    Returns None when nothing changed, so idle habitats cost no bandwidth.
+    """
+    def __init__(self,
+                 deadbands: Optional[Dict[str, float]] = None,
+                 resync_interval: int = DEFAULT_RESYNC_INTERVAL):
+        self.deadbands = dict(DEFAULT_DEADBANDS if deadbands is None else deadbands)
+        self.resync_interval = resync_interval
+        self.seq = 0
+        self.frames_since_keyframe = 0
+        self.last_sent: Dict[str, Any] = {}
+        self.last_sensory: Optional[str] = None
+
+    def keyframe(self, telemetry: Dict, sensory: Optional[str] = None) -> Dict:
+        """Full-state frame. Sent on connect and every `resync_interval` ticks."""
+        self.seq += 1
+        self.frames_since_keyframe = 0
+        self.last_sent = dict(telemetry)
+        self.last_sensory = sensory
+        return self.snapshot(telemetry, sensory)
+
+    def snapshot(self, telemetry: Dict, sensory: Optional[str] = None) -> Dict:
+        """
+        Keyframe for a single lagging client that leaves the shared delta baseline untouched.
+        The client may differ from the baseline by at most one deadband until the next keyframe.
+        """
+        return {
+            "type": "TELEMETRY",
+            "keyframe": True,
+            "seq": self.seq,
+            "telemetry": telemetry,
+            "sensory": sensory
+        }
+
+    def reset(self):
+        """Forces a keyframe on the next `encode` (e.g. after the habitat was rewound)."""
+        self.last_sent = {}
+
+    def encode(self, telemetry: Dict, sensory: Optional[str] = None) -> Optional[Dict]:
+        """Returns the next frame to broadcast, or None if there is nothing to send."""
+        self.frames_since_keyframe += 1
+        if not self.last_sent or self.frames_since_keyframe >= self.resync_interval:
+            return self.keyframe(telemetry, sensory)
+
+        delta = {}
+        for key, value in telemetry.items():
+            if self._changed(key, self.last_sent.get(key), value):
+                delta[key] = value
+                self.last_sent[key] = value
+
+        sensory_changed = sensory is not None and sensory != self.last_sensory
+        if not delta and not sensory_changed:
+            return None
+
+        self.seq += 1
+        frame = {"type": "TELEMETRY_DELTA", "seq": self.seq, "delta": delta}
+        if sensory_changed:
+            frame["sensory"] = sensory
+            self.last_sensory = sensory
+        return frame
+
+    def _changed(self, key: str, old: Any, new: Any) -> bool:
+        band = self.deadbands.get(key)
+        if band is None or not isinstance(new, (int, float)) or not isinstance(old, (int, float)):
+            return old != new
+        return abs(new - old) + _EPSILON >= band
@@ -0,0 +1,66 @@
+"""
+@file verify_keyword_scanner.py
+@description Checks that the Level 1 keyword scanner catches inflected danger words without flagging look-alikes.
+@module AIInterpreter
+
+Usage: python -m MVP.verify_keyword_scanner
+"""
+
+from MVP.ai_middleware import DANGER_KEYWORDS
+from MVP.keyword_scanner import KeywordAutomaton
+
+# (input, keyword that must be reported)
+MUST_MATCH = [
+    ("the wiring is burnt", "burn"),
+    ("I have eaten the ration bar", "eat"),
+    ("Jack ate the sealant", "eat"),
+    ("drink poisonous coolant", "drink poison"),
+    ("he drank poison by mistake", "drink poison"),
+    ("stop removing helmet seals", "remove helmet"),
+    ("the tank is exploding", "explode"),
+    ("try detonating the charge", "detonate"),
+    ("keep cutting wire after wire", "cut wire"),
+    ("the hatch was broken", "break"),
+    ("burning the filter", "burn"),
+    ("lick the panel", "lick"),
+    ("SHORT CIRCUITING the relay", "short circuit"),
+]
+
+# Must stay clean: the keyword only appears inside a longer word
+MUST_NOT_MATCH = [
+    "check the heater",
+    "read the theater schedule",
+    "the fireplace is cold",
+    "open the locker",
+    "look at the sticker on the scrubber",
+]
+
+def test_keyword_scanner():
+    scanner = KeywordAutomaton(DANGER_KEYWORDS)
+    failures = []
+    for text, keyword in MUST_MATCH:
+        found = [hit.keyword for hit in scanner.scan(text)]
+        if keyword not in found:
+            failures.append(f"missed '{keyword}' in '{text}' (got {found})")
+    for text in MUST_NOT_MATCH:
+        hits = scanner.scan(text)
+        if hits:
+            failures.append(f"false positive in '{text}': {[hit.keyword for hit in hits]}")
+
+    # An inflection that is also base + suffix is reported once
+    assert len(scanner.scan("it exploded")) == 1
+
+    # The substring loop (small lists) and the automaton (large lists) must agree exactly
+    automaton = KeywordAutomaton(DANGER_KEYWORDS, min_automaton_patterns=0)
+    looped = KeywordAutomaton(DANGER_KEYWORDS, min_automaton_patterns=automaton.patterns + 1)
+    for text in [text for text, _ in MUST_MATCH] + MUST_NOT_MATCH + ["it exploded, then ate ate the wire"]:
+        if automaton.scan(text) != looped.scan(text):
+            failures.append(f"loop and automaton disagree on '{text}'")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    assert not failures, f"{len(failures)} keyword scanner check(s) failed"
+    print(f"[OK] {len(MUST_MATCH)} inflected inputs caught, {len(MUST_NOT_MATCH)} look-alikes ignored")
+
+if __name__ == "__main__":
+    test_keyword_scanner()
@@ -1,5 +1,5 @@
-from survivor_jack import SurvivorJack
-from prompts import JACK_SYSTEM_PROMPT
+from MVP.survivor_jack import SurvivorJack
+from MVP.prompts import JACK_SYSTEM_PROMPT
 
 def verify():
     print("--- VERIFICATION START ---")
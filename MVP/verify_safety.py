@@ -1,5 +1,5 @@
-from survivor_jack import SurvivorJack
-from ai_middleware import CommandInterpreter
+from MVP.survivor_jack import SurvivorJack
+from MVP.ai_middleware import CommandInterpreter
 import time
 
 def test_safety():
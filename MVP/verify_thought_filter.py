@@ -0,0 +1,60 @@
+"""
+@file verify_thought_filter.py
+@description Checks that streamed replies (ThoughtFilter) match strip_thought and never leak the thought section.
+@module PersonaManagement
+
+Usage: python -m MVP.verify_thought_filter [--splits 200]
+"""
+
+import argparse
+import random
+from MVP.survivor_jack import ThoughtFilter, strip_thought
+
+# (raw model output, what the player must see)
+CASES = [
+    ("[INTERNAL THOUGHT] I'm scared. [RESPONSE] Checking the shelf now.", "Checking the shelf now."),
+    ("[INTERNAL THOUGHT] hm [RESPONSE] Fine. [INTERNAL THOUGHT] more [RESPONSE] tail", "Fine. tail"),
+    ("**[INTERNAL THOUGHT]** calm\n**[RESPONSE]** Got it.", "Got it."),
+    ("__[Internal Thought]__ calm\n[response]: Got it.", "Got it."),
+    ("[INTERNAL THOUGHT] Nothing to say yet, just thinking.", ThoughtFilter.FALLBACK_REPLY),
+    ("Just a plain reply.", "Just a plain reply."),
+    ("[RESPONSE] **Careful** with the _red_ valve [B-2].", "**Careful** with the _red_ valve [B-2]."),
+    ("[RESPONSE] Line one.\n\nLine two.  ", "Line one.\n\nLine two."),
+    ("[RESPONSE] Wait, [INTERNAL THOUGHT] stall [RESPONSE]   go.", "Wait, go."),
+    ("", ""),
+]
+
+def stream(text: str, cuts) -> str:
+    thought_filter = ThoughtFilter()
+    pieces, start = [], 0
+    for cut in sorted(cuts) + [len(text)]:
+        pieces.append(thought_filter.feed(text[start:cut]))
+        start = cut
+    pieces.append(thought_filter.flush())
+    return "".join(pieces)
+
+def test_thought_filter(splits: int = 200, seed: int = 3):
+    rng = random.Random(seed)
+    failures = []
+    for raw, expected in CASES:
+        stripped = strip_thought(raw)
+        if stripped != expected:
+            failures.append(f"strip_thought({raw!r}) = {stripped!r}, expected {expected!r}")
+        for _ in range(splits):
+            cuts = rng.sample(range(1, len(raw)), min(len(raw) - 1, rng.randint(1, 8))) if len(raw) > 1 else []
+            streamed = stream(raw, cuts)
+            if streamed != expected:
+                failures.append(f"streamed {raw!r} split at {sorted(cuts)} = {streamed!r}, expected {expected!r}")
+                break
+        if "thought" in stream(raw, list(range(1, len(raw)))).lower():
+            failures.append(f"thought leaked from {raw!r} (one character per chunk)")
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    assert not failures, f"{len(failures)} thought filter check(s) failed"
+    print(f"[OK] {len(CASES)} replies, {splits} random chunkings each: streamed text equals strip_thought")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--splits", type=int, default=200)
+    test_thought_filter(parser.parse_args().splits)
@@ -24,6 +24,7 @@ export const useGameController = () => {
   const [isTyping, setIsTyping] = useState(false);
   const [telemetry, setTelemetry] = useState<Telemetry>(DEFAULT_TELEMETRY);
   const ws = useRef<WebSocket | null>(null);
+  const streamingId = useRef<string | null>(null);
 
   useEffect(() => {
     // Connect to WebSocket Server
@@ -43,20 +44,62 @@ export const useGameController = () => {
         const data = JSON.parse(event.data);
         console.log('[CLIENT] Received:', data);
 
-        // Update Telemetry if present
+        // Update Telemetry if present (full snapshot / keyframe)
         if (data.telemetry) {
             setTelemetry(data.telemetry);
         }
 
+        // Delta frames only carry the fields that changed since the last frame
+        if (data.type === 'TELEMETRY_DELTA' && data.delta) {
+            setTelemetry(prev => ({ ...prev, ...data.delta }));
+        }
+
         // Handle Message Types
         if (data.type === 'INIT') {
              setMessages(prev => [...prev, { id: Date.now().toString(), sender: 'System', text: data.message }]);
-        } else if (data.type === 'TICK') {
+        } else if (data.type === 'TICK' || data.type === 'TELEMETRY' || data.type === 'TELEMETRY_DELTA') {
             // Telemetry update handled above
             if (data.sensory) {
                  // Optional: Log sensory data to console or a debug panel
                  console.log('[SENSORY]', data.sensory);
             }
+        } else if (data.type === 'RESPONSE_CHUNK') {
+            // Streamed reply: first chunk opens Jack's message, later chunks extend it
+            setIsTyping(false);
+            if (!streamingId.current) {
+                const id = Date.now().toString();
+                streamingId.current = id;
+                setMessages(prev => [...prev, { id, sender: 'Jack', text: data.delta }]);
+            } else {
+                const id = streamingId.current;
+                setMessages(prev => prev.map(m => m.id === id ? { ...m, text: m.text + data.delta } : m));
+            }
+        } else if (data.type === 'RESPONSE_END') {
+            setIsTyping(false);
+            const id = streamingId.current;
+            streamingId.current = null;
+            if (id) {
+                setMessages(prev => prev.map(m => m.id === id ? { ...m, text: data.jack_response } : m));
+            } else if (data.jack_response) {
+                setMessages(prev => [...prev, { id: Date.now().toString(), sender: 'Jack', text: data.jack_response }]);
+            }
+        } else if (data.type === 'CANCELLED') {
+            // A command was dropped. If it had started, its partial reply is void and Jack stopped typing
+            const note = `Command "${data.text}" ${data.started ? 'cancelled' : 'dropped'} (${data.reason}).`;
+            if (data.started) {
+                setIsTyping(false);
+                const id = streamingId.current;
+                streamingId.current = null;
+                if (id) {
+                    setMessages(prev => prev.map(m => m.id === id ? { ...m, text: m.text + ' [cut off]' } : m));
+                }
+            }
+            setMessages(prev => [...prev, { id: (Date.now()+1).toString(), sender: 'System', text: note }]);
+        } else if (data.type === 'ERROR') {
+            // Server-side failure (command crashed, server full): end any reply in progress
+            setIsTyping(false);
+            streamingId.current = null;
+            setMessages(prev => [...prev, { id: (Date.now()+1).toString(), sender: 'System', text: data.message }]);
         } else if (data.type === 'RESPONSE' || data.type === 'UPDATE' || data.type === 'WIN' || data.type === 'GAME_OVER' || data.type === 'INTERCEPT') {
             setIsTyping(false);
             if (data.jack_response) {
@@ -86,7 +129,7 @@ export const useGameController = () => {
         setIsTyping(true);
 
         // Send to Backend
-        ws.current.send(JSON.stringify({ text }));
+        ws.current.send(JSON.stringify({ text, stream: true }));
     } else {
         console.error("WebSocket not connected");
     }